@@ -64,6 +64,7 @@ class Settings(BaseSettings):
     
     # Rate limiting and performance
     max_concurrent_requests: int = Field(10, description="Maximum concurrent API requests")
+    prophetx_requests_per_second: float = Field(20.0, description="Maximum ProphetX API requests started per second")
     request_timeout_seconds: int = Field(30, description="API request timeout")
     
     # =============================================================================
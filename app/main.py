@@ -10,6 +10,7 @@ from contextlib import asynccontextmanager
 import uvicorn
 
 from app.core.config import get_settings
+from app.utils.enhanced_logging import setup_app_logger
 from app.routers import markets, positions, events, auth, matching, prophetx
 
 # Global settings
@@ -19,6 +20,7 @@ settings = get_settings()
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
+    setup_app_logger(settings.log_level)
     print("🏗️  ProphetX Market Maker starting up...")
     print(f"📝 Environment: {'SANDBOX' if settings.prophetx_sandbox else 'PRODUCTION'}")
     print(f"🎾 Focus: MLB market making using Pinnacle odds")
@@ -27,6 +29,10 @@ async def lifespan(app: FastAPI):
     # Initialize core services
     from app.services.odds_api_service import odds_api_service
     from app.services.market_maker_service import market_maker_service
+    from app.services.prophetx_service import prophetx_service
+    
+    # One HTTP connection pool per process, opened in this event loop
+    await prophetx_service.startup()
     
     # Start background odds polling if enabled
     if settings.auto_start_polling:
@@ -38,6 +44,9 @@ async def lifespan(app: FastAPI):
     # Shutdown
     print("🛑 ProphetX Market Maker shutting down...")
     await market_maker_service.shutdown()
+    await odds_api_service.close()
+    await prophetx_service.stop_auth_monitoring()
+    await prophetx_service.aclose()
 
 # Create FastAPI app
 app = FastAPI(
@@ -17,7 +17,7 @@ from .market_models import (
 
 from .prophetx_market_models import (
     ProphetXLine, ProphetXRawMarket, ProphetXEventMarkets,
-    MarketMatchResult, OutcomeMapping, EventMarketsMatch,
+    MarketMatchResult, OutcomeMapping, OutcomeMappingDict, EventMarketsMatch,
     ProphetXMarketType, ProphetXLineStatus
 )
 
@@ -34,6 +34,6 @@ __all__ = [
     
     # ProphetX market models
     "ProphetXLine", "ProphetXRawMarket", "ProphetXEventMarkets",
-    "MarketMatchResult", "OutcomeMapping", "EventMarketsMatch",
+    "MarketMatchResult", "OutcomeMapping", "OutcomeMappingDict", "EventMarketsMatch",
     "ProphetXMarketType", "ProphetXLineStatus"
 ]
\ No newline at end of file
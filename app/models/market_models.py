@@ -48,6 +48,8 @@ class ProphetXBet(BaseModel):
     """Represents a single bet we've placed on ProphetX"""
     bet_id: Optional[str] = Field(None, description="ProphetX bet ID")
     external_id: str = Field(..., description="Our unique bet identifier")
+    event_id: Optional[str] = Field(None, description="ProphetX event this bet belongs to")
+    market_type: Optional[str] = Field(None, description="Odds API market key (h2h, spreads, totals)")
     line_id: str = Field(..., description="ProphetX line ID")
     
     # Bet details
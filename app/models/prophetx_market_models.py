@@ -1,14 +1,20 @@
 #!/usr/bin/env python3
 """
 ProphetX Market Models
-Pydantic models for ProphetX market data structures
+Models for ProphetX market data structures
+
+Lines and markets are slotted dataclasses because thousands of them are built
+per event batch; the matching results remain Pydantic models.
 """
 
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional, Dict, Any, Union
-from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Union, Tuple, TypedDict, Callable
+from pydantic import BaseModel, Field, PrivateAttr
 from enum import Enum
 
+import numpy as np
+
 # =============================================================================
 # ProphetX Market Enums
 # =============================================================================
@@ -30,17 +36,22 @@ class ProphetXLineStatus(str, Enum):
 # ProphetX Market Response Models
 # =============================================================================
 
-class ProphetXLine(BaseModel):
+def _half_point_key(point: float) -> float:
+    """Snap a spread/total point to the half-point grid ProphetX lines sit on"""
+    return round(point * 2) / 2
+
+@dataclass(slots=True, frozen=True)
+class ProphetXLine:
     """Individual betting line within a ProphetX market"""
-    line_id: str = Field(..., description="Unique ProphetX line identifier for betting")
-    selection_name: str = Field(..., description="Name of the selection (e.g., 'Detroit Tigers')")
-    odds: Union[int, float] = Field(..., description="Odds in American format")
-    point: Optional[float] = Field(None, description="Point value for spreads/totals")
-    status: str = Field(default="active", description="Line status")
+    line_id: str                        # Unique ProphetX line identifier for betting
+    selection_name: str                 # Name of the selection (e.g., 'Detroit Tigers')
+    odds: Union[int, float]             # Odds in American format
+    point: Optional[float] = None       # Point value for spreads/totals
+    status: str = "active"              # Line status
     
     # Additional ProphetX-specific fields
-    max_bet: Optional[float] = Field(None, description="Maximum bet amount allowed")
-    min_bet: Optional[float] = Field(None, description="Minimum bet amount")
+    max_bet: Optional[float] = None     # Maximum bet amount allowed
+    min_bet: Optional[float] = None     # Minimum bet amount
     
     @property
     def american_odds(self) -> int:
@@ -55,23 +66,50 @@ class ProphetXLine(BaseModel):
         """Check if line is available for betting"""
         return self.status.lower() == "active" and self.odds != 0
 
-class ProphetXRawMarket(BaseModel):
+class _MarketCaches:
+    """
+    Per-market lookup caches kept out of ProphetXRawMarket's fields
+    
+    They live in base-class slots rather than dataclass fields, so Pydantic
+    neither validates nor serializes them (model_dump of ProphetXEventMarkets
+    would otherwise choke on the numpy arrays).
+    """
+    __slots__ = ("_soa", "_point_buckets", "_normalized_names")
+    
+    # Cached struct-of-arrays view of the lines: (names, points, odds, line_ids)
+    _soa: Optional[Tuple[List[str], np.ndarray, np.ndarray, List[str]]]
+    
+    # Line indices bucketed by point on the half-point grid
+    _point_buckets: Optional[Dict[float, List[int]]]
+    
+    # Normalized selection names, parallel to lines
+    _normalized_names: Optional[List[str]]
+
+@dataclass(slots=True)
+class ProphetXRawMarket(_MarketCaches):
     """A complete market from ProphetX (e.g., moneyline, spread, total)"""
-    market_id: str = Field(..., description="ProphetX market identifier")
-    market_type: str = Field(..., description="Type of market (moneyline, spread, total)")
-    event_id: int = Field(..., description="Associated ProphetX event ID")
+    market_id: str                      # ProphetX market identifier
+    market_type: str                    # Type of market (moneyline, spread, total)
+    event_id: int                       # Associated ProphetX event ID
     
     # Market details
-    name: str = Field(..., description="Market display name")
-    description: Optional[str] = Field(None, description="Market description")
-    status: str = Field(default="active", description="Market status")
+    name: str                           # Market display name
     
     # Lines within this market
-    lines: List[ProphetXLine] = Field(..., description="All betting lines in this market")
+    lines: List[ProphetXLine]           # All betting lines in this market
+    
+    description: Optional[str] = None   # Market description
+    status: str = "active"              # Market status
     
     # Metadata
-    created_at: Optional[datetime] = Field(None, description="When market was created")
-    updated_at: Optional[datetime] = Field(None, description="Last update time")
+    created_at: Optional[datetime] = None   # When market was created
+    updated_at: Optional[datetime] = None   # Last update time
+    
+    def __post_init__(self):
+        # Caches are built on first use
+        self._soa = None
+        self._point_buckets = None
+        self._normalized_names = None
     
     @property
     def is_active(self) -> bool:
@@ -91,13 +129,69 @@ class ProphetXRawMarket(BaseModel):
                 return line
         return None
     
+    def to_soa(self) -> Tuple[List[str], np.ndarray, np.ndarray, List[str]]:
+        """
+        Get the lines as parallel arrays: (names, points, odds, line_ids)
+        
+        Points are float32 with NaN for lines without a point, odds are int32
+        American odds (0 for inactive lines). Built once and cached.
+        """
+        if self._soa is None:
+            names = [line.selection_name for line in self.lines]
+            points = np.asarray(
+                [np.nan if line.point is None else line.point for line in self.lines],
+                dtype=np.float32
+            )
+            odds = np.asarray([line.american_odds for line in self.lines], dtype=np.int32)
+            line_ids = [line.line_id for line in self.lines]
+            self._soa = (names, points, odds, line_ids)
+        return self._soa
+    
+    def get_normalized_names(self, normalize: Callable[[str], str]) -> List[str]:
+        """
+        Selection names run through normalize, parallel to lines
+        
+        Computed once per market so matching every outcome reuses the same list.
+        """
+        if self._normalized_names is None:
+            self._normalized_names = [normalize(line.selection_name) for line in self.lines]
+        return self._normalized_names
+    
+    def get_point_indices(self, point: float, tolerance: float = 0.1) -> List[int]:
+        """
+        Indices (in line order) of lines whose point is within tolerance of point
+        
+        Lines are bucketed by their nearest half point once, so a lookup only
+        checks the buckets from point - tolerance to point + tolerance (two for
+        the usual small tolerances).
+        """
+        if tolerance >= 0.5:
+            # Window spans many buckets - scan everything
+            return [i for i, line in enumerate(self.lines)
+                    if line.point is not None and abs(line.point - point) <= tolerance]
+        
+        if self._point_buckets is None:
+            buckets: Dict[float, List[int]] = {}
+            for i, line in enumerate(self.lines):
+                if line.point is not None:
+                    buckets.setdefault(_half_point_key(line.point), []).append(i)
+            self._point_buckets = buckets
+        
+        # Every half-point key the window can touch, not just its two ends - a
+        # window wider than 0.5 (tolerance >= 0.25) covers a whole bucket between them
+        low_key = _half_point_key(point - tolerance)
+        high_key = _half_point_key(point + tolerance)
+        bucket_keys = [low_key + step / 2 for step in range(int(round((high_key - low_key) * 2)) + 1)]
+        return sorted(
+            i
+            for key in bucket_keys
+            for i in self._point_buckets.get(key, ())
+            if abs(self.lines[i].point - point) <= tolerance
+        )
+    
     def get_lines_by_point(self, point: float, tolerance: float = 0.1) -> List[ProphetXLine]:
         """Find lines with specific point value (for spreads/totals)"""
-        matching_lines = []
-        for line in self.lines:
-            if line.point is not None and abs(line.point - point) <= tolerance:
-                matching_lines.append(line)
-        return matching_lines
+        return [self.lines[i] for i in self.get_point_indices(point, tolerance)]
 
 class ProphetXEventMarkets(BaseModel):
     """All markets for a specific ProphetX event"""
@@ -109,6 +203,19 @@ class ProphetXEventMarkets(BaseModel):
     last_updated: datetime = Field(..., description="When market data was last fetched")
     raw_response: Optional[Dict[str, Any]] = Field(None, description="Raw ProphetX API response")
     
+    # Markets indexed by normalized type (first market of each type wins)
+    _by_type: Optional[Dict[str, ProphetXRawMarket]] = PrivateAttr(default=None)
+    
+    @property
+    def by_type(self) -> Dict[str, ProphetXRawMarket]:
+        """Markets keyed by normalized market type, built once on first access"""
+        if self._by_type is None:
+            by_type: Dict[str, ProphetXRawMarket] = {}
+            for market in self.markets:
+                by_type.setdefault(market.market_type.lower().strip(), market)
+            self._by_type = by_type
+        return self._by_type
+    
     @property
     def active_markets(self) -> List[ProphetXRawMarket]:
         """Get only active markets"""
@@ -116,23 +223,19 @@ class ProphetXEventMarkets(BaseModel):
     
     def get_market_by_type(self, market_type: str) -> Optional[ProphetXRawMarket]:
         """Get market by type (moneyline, spread, total)"""
-        normalized_type = market_type.lower().strip()
-        for market in self.markets:
-            if market.market_type.lower().strip() == normalized_type:
-                return market
-        return None
+        return self.by_type.get(market_type.lower().strip())
     
     def get_moneyline_market(self) -> Optional[ProphetXRawMarket]:
         """Get moneyline market"""
-        return self.get_market_by_type("moneyline")
+        return self.by_type.get("moneyline")
     
     def get_spread_market(self) -> Optional[ProphetXRawMarket]:
         """Get spread market"""
-        return self.get_market_by_type("spread")
+        return self.by_type.get("spread")
     
     def get_total_market(self) -> Optional[ProphetXRawMarket]:
         """Get total (over/under) market"""
-        return self.get_market_by_type("total")
+        return self.by_type.get("total")
 
 # =============================================================================
 # Market Matching Models
@@ -192,6 +295,35 @@ class OutcomeMapping(BaseModel):
             return 0.0
         return abs(self.odds_api_point - self.prophetx_point)
 
+class OutcomeMappingDict(TypedDict, total=False):
+    """
+    Outcome mapping as stored in MarketMatchResult.outcome_mappings
+    
+    Same fields as OutcomeMapping plus the ProphetX line status keys; built as a
+    plain dict literal on the matching hot path.
+    """
+    # Odds API side
+    odds_api_outcome_name: str
+    odds_api_odds: int
+    odds_api_point: Optional[float]
+    
+    # ProphetX side
+    prophetx_line_id: str
+    prophetx_selection_name: str
+    prophetx_odds: int
+    prophetx_point: Optional[float]
+    
+    # Match details
+    confidence_score: float
+    name_similarity: float
+    point_match: bool
+    
+    # Line status
+    prophetx_line_active: bool
+    prophetx_line_status: str
+    market_making_opportunity: bool
+    note: str  # Only present for inactive lines
+
 class EventMarketsMatch(BaseModel):
     """Complete market matching result for an event"""
     # Event info
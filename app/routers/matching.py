@@ -459,9 +459,12 @@ async def get_market_matching_summary():
         partial_matches = []
         failed_matches = []
         
-        for event_match in confirmed_matches:
+        market_results = await market_matching_service.match_all(confirmed_matches, return_exceptions=True)
+        
+        for event_match, market_result in zip(confirmed_matches, market_results):
             try:
-                market_result = await market_matching_service.match_event_markets(event_match)
+                if isinstance(market_result, Exception):
+                    raise market_result
                 
                 event_summary = {
                     "odds_api_event_id": market_result.odds_api_event_id,
@@ -4,11 +4,14 @@ Bet Monitoring Service
 Monitors bet status and handles fills on ProphetX
 """
 
+import logging
 import asyncio
 import time
 from typing import Dict, List, Optional
 from datetime import datetime, timezone
 
+logger = logging.getLogger(__name__)
+
 class BetMonitoringService:
     """Service for monitoring bet status and handling fills"""
     
@@ -20,14 +23,14 @@ class BetMonitoringService:
     async def start_monitoring(self):
         """Start continuous bet monitoring"""
         self.monitoring_active = True
-        print("🔍 Starting bet status monitoring...")
+        logger.info("🔍 Starting bet status monitoring...")
         
         while self.monitoring_active:
             try:
                 await self._check_all_bet_statuses()
                 await asyncio.sleep(self.status_check_interval)
             except Exception as e:
-                print(f"❌ Error in bet monitoring: {e}")
+                logger.error("❌ Error in bet monitoring: %s", e)
                 await asyncio.sleep(10)  # Wait before retrying
     
     async def _check_all_bet_statuses(self):
@@ -41,7 +44,7 @@ class BetMonitoringService:
         if not active_bets:
             return
             
-        print(f"🔍 Checking status of {len(active_bets)} active bets...")
+        logger.info("🔍 Checking status of %d active bets...", len(active_bets))
         
         for bet in active_bets:
             try:
@@ -52,7 +55,7 @@ class BetMonitoringService:
                     await self._process_bet_status_update(bet, status)
                     
             except Exception as e:
-                print(f"❌ Error checking bet {bet.external_id}: {e}")
+                logger.error("❌ Error checking bet %s: %s", bet.external_id, e)
                 continue
     
     async def _check_all_bet_statuses(self):
@@ -66,7 +69,7 @@ class BetMonitoringService:
         if not our_active_bets:
             return
             
-        print(f"🔍 Checking status of {len(our_active_bets)} active bets...")
+        logger.info("🔍 Checking status of %d active bets...", len(our_active_bets))
         
         try:
             # Get all active wagers from ProphetX
@@ -90,8 +93,8 @@ class BetMonitoringService:
                         if external_id:
                             matched_bets_map[external_id] = bet
             
-            print(f"   📊 Active wagers map: {len(active_wagers_map)} entries")
-            print(f"   🎯 Matched bets map: {len(matched_bets_map)} entries")
+            logger.info("   📊 Active wagers map: %d entries", len(active_wagers_map))
+            logger.info("   🎯 Matched bets map: %d entries", len(matched_bets_map))
             
             # Check each of our bets against ProphetX data
             bets_found_active = 0
@@ -108,13 +111,13 @@ class BetMonitoringService:
                     else:
                         bets_not_found += 1
                 except Exception as e:
-                    print(f"   ❌ Error updating bet {our_bet.external_id}: {e}")
+                    logger.error("   ❌ Error updating bet %s: %s", our_bet.external_id, e)
                     bets_not_found += 1
             
-            print(f"   📊 Status summary: {bets_found_active} still active, {bets_found_matched} matched, {bets_not_found} not found")
+            logger.info("   📊 Status summary: %d still active, %d matched, %d not found", bets_found_active, bets_found_matched, bets_not_found)
                 
         except Exception as e:
-            print(f"❌ Error in bulk bet status check: {e}")
+            logger.error("❌ Error in bulk bet status check: %s", e)
             import traceback
             traceback.print_exc()
 
@@ -129,7 +132,7 @@ class BetMonitoringService:
         if not our_active_bets:
             return
             
-        print(f"🔍 Checking status of {len(our_active_bets)} active bets...")
+        logger.info("🔍 Checking status of %d active bets...", len(our_active_bets))
         
         try:
             # Get all active wagers from ProphetX
@@ -162,9 +165,9 @@ class BetMonitoringService:
                         if prophetx_bet_id:
                             matched_bets_by_prophetx_id[str(prophetx_bet_id)] = bet
             
-            print(f"   📊 Active wagers map: {len(active_wagers_map)} entries")
-            print(f"   🎯 Matched bets map: {len(matched_bets_map)} entries (by external_id)")
-            print(f"   🆔 Matched bets by ProphetX ID: {len(matched_bets_by_prophetx_id)} entries")
+            logger.info("   📊 Active wagers map: %d entries", len(active_wagers_map))
+            logger.info("   🎯 Matched bets map: %d entries (by external_id)", len(matched_bets_map))
+            logger.info("   🆔 Matched bets by ProphetX ID: %d entries", len(matched_bets_by_prophetx_id))
             
             # Check each of our bets against ProphetX data
             bets_found_active = 0
@@ -183,13 +186,13 @@ class BetMonitoringService:
                     else:
                         bets_not_found += 1
                 except Exception as e:
-                    print(f"   ❌ Error updating bet {our_bet.external_id}: {e}")
+                    logger.error("   ❌ Error updating bet %s: %s", our_bet.external_id, e)
                     bets_not_found += 1
             
-            print(f"   📊 Status summary: {bets_found_active} still active, {bets_found_matched} matched, {bets_not_found} not found")
+            logger.info("   📊 Status summary: %d still active, %d matched, %d not found", bets_found_active, bets_found_matched, bets_not_found)
                 
         except Exception as e:
-            print(f"❌ Error in bulk bet status check: {e}")
+            logger.error("❌ Error in bulk bet status check: %s", e)
             import traceback
             traceback.print_exc()
 
@@ -213,18 +216,18 @@ class BetMonitoringService:
         # Check if bet has been matched by external_id
         elif external_id in matched_bets_map:
             matched_bet = matched_bets_map[external_id]
-            print(f"🎉 FOUND MATCHED BET (by external_id): {our_bet.selection_name}")
+            logger.info("🎉 FOUND MATCHED BET (by external_id): %s", our_bet.selection_name)
             return await self._process_matched_bet(our_bet, matched_bet)
             
         # Check if bet has been matched by ProphetX ID (fallback)
         elif our_bet.bet_id and our_bet.bet_id in matched_bets_by_prophetx_id:
             matched_bet = matched_bets_by_prophetx_id[our_bet.bet_id]
-            print(f"🎉 FOUND MATCHED BET (by ProphetX ID): {our_bet.selection_name}")
+            logger.info("🎉 FOUND MATCHED BET (by ProphetX ID): %s", our_bet.selection_name)
             return await self._process_matched_bet(our_bet, matched_bet)
         
         else:
             # Bet not found in active or matched - investigate further
-            print(f"❓ {our_bet.selection_name}: Not found in ProphetX active or matched bets")
+            logger.info("❓ %s: Not found in ProphetX active or matched bets", our_bet.selection_name)
             
             # Try to get specific bet details if we have a ProphetX bet ID
             if our_bet.bet_id:
@@ -235,31 +238,31 @@ class BetMonitoringService:
                         status = bet_details.get('status', 'unknown').lower()
                         matching_status = bet_details.get('matching_status', 'unknown').lower()
                         
-                        print(f"   🔍 Bet details: status={status}, matching_status={matching_status}")
+                        logger.info("   🔍 Bet details: status=%s, matching_status=%s", status, matching_status)
                         
                         # Check if it's matched but not in our matched bets list
                         if matching_status in ['fully_matched', 'partially_matched']:
-                            print(f"🎉 FOUND MATCHED BET (by individual lookup): {our_bet.selection_name}")
+                            logger.info("🎉 FOUND MATCHED BET (by individual lookup): %s", our_bet.selection_name)
                             return await self._process_matched_bet(our_bet, bet_details)
                         
                         # Check if it's cancelled/expired/etc
                         if status in ['cancelled', 'expired', 'rejected', 'void']:
                             our_bet.status = status
                             our_bet.unmatched_stake = 0.0
-                            print(f"   ❌ Bet {status}: {our_bet.selection_name}")
+                            logger.info("   ❌ Bet %s: %s", status, our_bet.selection_name)
                             return status
                             
                     else:
-                        print(f"   ⚠️  Bet details not found (404) - likely matched and settled")
+                        logger.warning("   ⚠️  Bet details not found (404) - likely matched and settled")
                         # If bet returns 404, it might be matched and already settled
                         # Mark as matched with full amount
                         return await self._handle_missing_matched_bet(our_bet)
                         
                 except Exception as e:
-                    print(f"   ⚠️  Error getting bet details for {our_bet.bet_id}: {e}")
+                    logger.warning("   ⚠️  Error getting bet details for %s: %s", our_bet.bet_id, e)
             
             # If we can't find the bet anywhere, assume it's still pending but not yet visible
-            print(f"   ⏳ Bet status unclear - keeping as active for now")
+            logger.info("   ⏳ Bet status unclear - keeping as active for now")
             return "not_found"
     
     async def _process_matched_bet(self, our_bet, matched_bet_data):
@@ -275,13 +278,13 @@ class BetMonitoringService:
                     break
             
             if matched_amount is None:
-                print(f"   ❌ Could not determine matched amount from: {list(matched_bet_data.keys())}")
+                logger.error("   ❌ Could not determine matched amount from: %s", list(matched_bet_data.keys()))
                 return "error"
             
             original_stake = our_bet.stake
             
             if matched_amount > 0:
-                print(f"🎉 BET FILLED: {our_bet.selection_name} - ${matched_amount:.2f} matched!")
+                logger.info("🎉 BET FILLED: %s - $%.2f matched!", our_bet.selection_name, matched_amount)
                 
                 # Update bet status
                 our_bet.matched_stake = matched_amount
@@ -305,23 +308,23 @@ class BetMonitoringService:
                     our_bet.line_id, matched_amount, matched_amount
                 )
                 
-                print(f"   📊 Fill details:")
-                print(f"      Line: {our_bet.line_id}")
-                print(f"      Odds: {our_bet.odds:+d}")
-                print(f"      Matched: ${matched_amount:.2f}")
-                print(f"      Remaining: ${our_bet.unmatched_stake:.2f}")
-                print(f"      ⏱️  Starting 5-minute wait period for incremental liquidity")
+                logger.info("   📊 Fill details:")
+                logger.info("      Line: %s", our_bet.line_id)
+                logger.info("      Odds: %+d", our_bet.odds)
+                logger.info("      Matched: $%.2f", matched_amount)
+                logger.info("      Remaining: $%.2f", our_bet.unmatched_stake)
+                logger.info("      ⏱️  Starting 5-minute wait period for incremental liquidity")
                 
                 return "matched"
                 
         except (ValueError, TypeError) as e:
-            print(f"   ❌ Error processing matched bet data: {e}")
-            print(f"   📊 Matched bet data: {matched_bet_data}")
+            logger.error("   ❌ Error processing matched bet data: %s", e)
+            logger.info("   📊 Matched bet data: %s", matched_bet_data)
             return "error"
     
     async def _handle_missing_matched_bet(self, our_bet):
         """Handle case where bet is missing (likely matched and settled)"""
-        print(f"   💡 Assuming bet was fully matched (common when bet settles quickly)")
+        logger.info("   💡 Assuming bet was fully matched (common when bet settles quickly)")
         
         # Assume full match
         matched_amount = our_bet.stake
@@ -344,11 +347,11 @@ class BetMonitoringService:
             our_bet.line_id, matched_amount, matched_amount
         )
         
-        print(f"   📊 Assumed fill details:")
-        print(f"      Line: {our_bet.line_id}")
-        print(f"      Odds: {our_bet.odds:+d}")
-        print(f"      Assumed matched: ${matched_amount:.2f}")
-        print(f"      ⏱️  Starting 5-minute wait period for incremental liquidity")
+        logger.info("   📊 Assumed fill details:")
+        logger.info("      Line: %s", our_bet.line_id)
+        logger.info("      Odds: %+d", our_bet.odds)
+        logger.info("      Assumed matched: $%.2f", matched_amount)
+        logger.info("      ⏱️  Starting 5-minute wait period for incremental liquidity")
         
         return "matched"
     
@@ -366,7 +369,7 @@ class BetMonitoringService:
         new_fill_amount = new_matched_amount - previous_matched
         
         if new_fill_amount > 0:
-            print(f"🎉 BET FILLED: {bet.selection_name} - ${new_fill_amount:.2f} matched!")
+            logger.info("🎉 BET FILLED: %s - $%.2f matched!", bet.selection_name, new_fill_amount)
             
             # Update bet object
             bet.matched_stake = new_matched_amount
@@ -385,12 +388,12 @@ class BetMonitoringService:
             )
             
             # Log fill details
-            print(f"   Line: {bet.line_id}")
-            print(f"   Selection: {bet.selection_name}")
-            print(f"   Odds: {bet.odds:+d}")
-            print(f"   Fill amount: ${new_fill_amount:.2f}")
-            print(f"   Total matched: ${new_matched_amount:.2f}")
-            print(f"   Still unmatched: ${bet.unmatched_stake:.2f}")
+            logger.info("   Line: %s", bet.line_id)
+            logger.info("   Selection: %s", bet.selection_name)
+            logger.info("   Odds: %+d", bet.odds)
+            logger.info("   Fill amount: $%.2f", new_fill_amount)
+            logger.info("   Total matched: $%.2f", new_matched_amount)
+            logger.info("   Still unmatched: $%.2f", bet.unmatched_stake)
             
             # Trigger 5-minute wait period for incremental betting
             from app.services.market_making_strategy import market_making_strategy
@@ -402,17 +405,17 @@ class BetMonitoringService:
         elif bet_status == 'cancelled':
             bet.status = "cancelled"
             bet.unmatched_stake = 0.0
-            print(f"❌ Bet cancelled: {bet.external_id}")
+            logger.info("❌ Bet cancelled: %s", bet.external_id)
             
         elif bet_status == 'expired':
             bet.status = "expired" 
             bet.unmatched_stake = 0.0
-            print(f"⏰ Bet expired: {bet.external_id}")
+            logger.info("⏰ Bet expired: %s", bet.external_id)
     
     def stop_monitoring(self):
         """Stop bet monitoring"""
         self.monitoring_active = False
-        print("🛑 Bet monitoring stopped")
+        logger.info("🛑 Bet monitoring stopped")
 
 # Global bet monitoring service instance
 bet_monitoring_service = BetMonitoringService()
\ No newline at end of file
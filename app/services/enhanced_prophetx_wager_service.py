@@ -11,10 +11,13 @@ Key for the line-based position monitoring workflow.
 """
 
 import asyncio
+import logging
+import orjson
 import time
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Any
-import aiohttp
+
+logger = logging.getLogger(__name__)
 
 class ProphetXWagerService:
     """Enhanced ProphetX wager service with line-based filtering"""
@@ -72,44 +75,44 @@ class ProphetXWagerService:
             headers = await self.prophetx_service.get_auth_headers()
             url = f"{self.base_url}/partner/v2/mm/get_wager_histories"  # <-- FIXED: Added /partner
             
-            print(f"🔍 Calling ProphetX API: {url}")
-            print(f"📊 Query params: {params}")
+            logger.debug("🔍 Calling ProphetX API: %s", url)
+            logger.debug("📊 Query params: %s", params)
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, params=params) as response:
-                    print(f"📡 API Response: HTTP {response.status}")
-                    
-                    if response.status == 200:
-                        data = await response.json()
-                        wagers = data.get("data", {}).get("wagers", [])
-                        
-                        print(f"📊 Retrieved {len(wagers)} total wagers from ProphetX")
-                        
-                        # Filter by line_id if specified (client-side filtering)
-                        if line_id:
-                            original_count = len(wagers)
-                            wagers = [w for w in wagers if w.get("line_id") == line_id]
-                            print(f"🔍 Filtered from {original_count} to {len(wagers)} wagers for line_id: {line_id}")
-                        
-                        return {
-                            "success": True,
-                            "wagers": wagers,
-                            "next_cursor": data.get("data", {}).get("next_cursor"),
-                            "last_synced_at": data.get("last_synced_at"),
-                            "total_retrieved": len(wagers),
-                            "filtered_by_line_id": line_id is not None
-                        }
-                    else:
-                        error_text = await response.text()
-                        print(f"❌ API Error: HTTP {response.status} - {error_text}")
-                        return {
-                            "success": False,
-                            "error": f"HTTP {response.status}: {error_text}",
-                            "status_code": response.status
-                        }
-                        
+            # Time-windowed params never repeat, so there is no ETag to revalidate
+            response = await self.prophetx_service.request("GET", url, headers=headers, params=params)
+            logger.debug("📡 API Response: HTTP %s", response.status_code)
+            
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                wagers = data.get("data", {}).get("wagers", [])
+                
+                logger.info("📊 Retrieved %d total wagers from ProphetX", len(wagers))
+                
+                # Filter by line_id if specified (client-side filtering)
+                if line_id:
+                    original_count = len(wagers)
+                    wagers = [w for w in wagers if w.get("line_id") == line_id]
+                    logger.info("🔍 Filtered from %s to %d wagers for line_id: %s", original_count, len(wagers), line_id)
+                
+                return {
+                    "success": True,
+                    "wagers": wagers,
+                    "next_cursor": data.get("data", {}).get("next_cursor"),
+                    "last_synced_at": data.get("last_synced_at"),
+                    "total_retrieved": len(wagers),
+                    "filtered_by_line_id": line_id is not None
+                }
+            else:
+                error_text = response.text
+                logger.error("❌ API Error: HTTP %s - %s", response.status_code, error_text)
+                return {
+                    "success": False,
+                    "error": f"HTTP {response.status_code}: {error_text}",
+                    "status_code": response.status_code
+                }
+                
         except Exception as e:
-            print(f"❌ Exception in get_wager_histories: {str(e)}")
+            logger.error("❌ Exception in get_wager_histories: %s", e)
             return {
                 "success": False,
                 "error": f"Exception: {str(e)}"
@@ -157,6 +160,10 @@ class ProphetXWagerService:
         manual_bets = []
         active_system_bets = []
         
+        # Totals from ACTIVE SYSTEM BETS only, accumulated while classifying
+        total_stake = 0
+        total_matched = 0
+        
         for wager in wagers:
             external_id = wager.get("external_id", "")
             status = wager.get("status", "").lower()
@@ -175,21 +182,20 @@ class ProphetXWagerService:
                 # Only include active system bets in calculations
                 if status not in ["canceled", "cancelled", "void"] and stake > 0:
                     active_system_bets.append(wager)
+                    total_stake += stake
+                    total_matched += wager.get("matched_stake", 0) or 0
             else:
                 manual_bets.append(wager)
         
-        # Calculate totals from ACTIVE SYSTEM BETS only
-        total_stake = sum(bet.get("stake", 0) or 0 for bet in active_system_bets)
-        total_matched = sum(bet.get("matched_stake", 0) or 0 for bet in active_system_bets)
         total_unmatched = total_stake - total_matched
         
         # Find last system bet time
         last_bet_time = None
         if system_bets:
             try:
-                sorted_bets = sorted(system_bets, key=lambda x: x.get("created_at", ""), reverse=True)
-                if sorted_bets[0].get("created_at"):
-                    last_bet_time = sorted_bets[0]["created_at"]
+                latest_bet = max(system_bets, key=lambda x: x.get("created_at", ""))
+                if latest_bet.get("created_at"):
+                    last_bet_time = latest_bet["created_at"]
             except:
                 pass
         
@@ -343,7 +349,7 @@ class ProphetXWagerService:
             return recent_fills
             
         except Exception as e:
-            print(f"❌ Error detecting recent fills: {e}")
+            logger.error("❌ Error detecting recent fills: %s", e)
             return []
             
     async def get_all_wagers_for_line(
@@ -372,11 +378,11 @@ class ProphetXWagerService:
             all_wagers = []
             next_cursor = None
             
-            print(f"🔍 Searching for wagers on line_id: {line_id}")
+            logger.info("🔍 Searching for wagers on line_id: %s", line_id)
             if system_bets_only:
-                print(f"   📊 System bets only (non-empty external_id)")
+                logger.debug("   📊 System bets only (non-empty external_id)")
                 if external_id_filter:
-                    print(f"   🔍 External ID filter: '{external_id_filter}*'")
+                    logger.debug("   🔍 External ID filter: '%s*'", external_id_filter)
             
             # Paginate through all results
             while True:
@@ -388,11 +394,11 @@ class ProphetXWagerService:
                 )
                 
                 if not result["success"]:
-                    print(f"❌ Failed to get wager histories: {result.get('error')}")
+                    logger.error("❌ Failed to get wager histories: %s", result.get('error'))
                     break
                 
                 wagers = result["wagers"]
-                print(f"📊 Retrieved {len(wagers)} total wagers from ProphetX")
+                logger.info("📊 Retrieved %d total wagers from ProphetX", len(wagers))
                 
                 # CLIENT-SIDE FILTERING: Filter by line_id
                 line_wagers = []
@@ -407,23 +413,23 @@ class ProphetXWagerService:
                         external_id = wager.get("external_id", "")
                         bet_type = "system" if external_id else "manual"
                         
-                        print(f"✅ Found {bet_type} wager: {external_id or 'UI_BET'} - ${stake} ({status})")
+                        logger.debug("✅ Found %s wager: %s - $%s (%s)", bet_type, external_id or 'UI_BET', stake, status)
                 
                 all_wagers.extend(line_wagers)
-                print(f"📊 Found {len(line_wagers)} wagers for line {line_id} in this batch")
+                logger.debug("📊 Found %d wagers for line %s in this batch", len(line_wagers), line_id)
                 
                 next_cursor = result.get("next_cursor")
                 if not next_cursor:
                     break
             
-            print(f"📊 TOTAL: Found {len(all_wagers)} wagers for line {line_id}")
+            logger.info("📊 TOTAL: Found %d wagers for line %s", len(all_wagers), line_id)
             
             # Calculate position summary with system bet filtering
             try:
                 filter_to_use = external_id_filter if system_bets_only else None
                 position_summary = self._calculate_position_summary(all_wagers, filter_to_use)
             except Exception as summary_error:
-                print(f"❌ Error calculating position summary: {summary_error}")
+                logger.error("❌ Error calculating position summary: %s", summary_error)
                 # Return a safe default summary
                 position_summary = {
                     "total_bets": len(all_wagers),
@@ -445,21 +451,21 @@ class ProphetXWagerService:
             
             # Enhanced logging for debugging
             if len(all_wagers) == 0:
-                print(f"💰 No wagers found for line {line_id[-8:]} - ready for initial bet")
+                logger.info("💰 No wagers found for line %s - ready for initial bet", line_id[-8:])
             else:
                 system_count = position_summary.get('system_bets', 0)
                 manual_count = position_summary.get('manual_bets', 0)
                 
-                print(f"💰 Line position summary (SYSTEM BETS ONLY):")
-                print(f"   All bets: {len(all_wagers)} ({system_count} system, {manual_count} manual)")
-                print(f"   Active system bets: {position_summary.get('active_system_bets', 0)}")
-                print(f"   System stake: ${position_summary['total_stake']:.2f}")
-                print(f"   System matched: ${position_summary['total_matched']:.2f}")
-                print(f"   System unmatched: ${position_summary['total_unmatched']:.2f}")
-                print(f"   Has active system liquidity: {position_summary['has_active_bets']}")
+                logger.info(
+                    "💰 Line position summary (SYSTEM BETS ONLY): %d bets (%d system, %d manual), %d active system, "
+                    "stake $%.2f, matched $%.2f, unmatched $%.2f, active liquidity: %s",
+                    len(all_wagers), system_count, manual_count, position_summary.get('active_system_bets', 0),
+                    position_summary['total_stake'], position_summary['total_matched'],
+                    position_summary['total_unmatched'], position_summary['has_active_bets']
+                )
                 
                 if manual_count > 0:
-                    print(f"   📝 Note: {manual_count} manual UI bets ignored in calculations")
+                    logger.info("   📝 Note: %d manual UI bets ignored in calculations", manual_count)
             
             return {
                 "success": True,
@@ -475,7 +481,7 @@ class ProphetXWagerService:
             }
             
         except Exception as e:
-            print(f"❌ Error getting wagers for line {line_id}: {e}")
+            logger.error("❌ Error getting wagers for line %s: %s", line_id, e)
             import traceback
             traceback.print_exc()
             
@@ -5,9 +5,10 @@ Core market making logic with incremental betting, exact Pinnacle replication, a
 """
 
 import asyncio
+import itertools
 import time
 from datetime import datetime, timezone, timedelta
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Set
 from fastapi import HTTPException
 
 from app.core.config import get_settings
@@ -19,6 +20,7 @@ from app.models.market_models import (
 from app.services.odds_api_service import odds_api_service
 from app.services.bet_monitoring_service import bet_monitoring_service
 from app.services.odds_change_handler import odds_change_handler
+from app.services.prophetx_service import prophetx_service
 # Import BettingInstruction at the end to avoid circular imports
 
 class PositionTracker:
@@ -73,6 +75,11 @@ class MarketMakerService:
         # Portfolio tracking
         self.managed_events: Dict[str, ManagedEvent] = {}
         self.all_bets: Dict[str, ProphetXBet] = {}  # external_id -> bet
+        # (event_id, market_type) -> external_ids. Mirrors all_bets, which keeps cancelled and
+        # settled bets too, so it is never pruned and grows for as long as all_bets lives;
+        # readers filter on bet.is_active
+        self.bets_by_event_market: Dict[Tuple[str, Optional[str]], Set[str]] = {}
+        self._bet_sequence = itertools.count(1)  # keeps external_ids unique within the same second
         
         # Position and fill tracking
         self.position_tracker = PositionTracker()
@@ -292,7 +299,6 @@ class MarketMakerService:
         
         # Get or create managed event
         if event_id not in self.managed_events:
-            from app.models.market_models import ManagedEvent, MarketStatus
             managed_event = ManagedEvent(
                 event_id=event_id,
                 sport=prophetx_event.sport_name,
@@ -421,12 +427,10 @@ class MarketMakerService:
         Place bet with retry logic and proper error handling
         ADD this method to MarketMakerService class
         """
-        from app.services.prophetx_service import prophetx_service
-        from app.models.market_models import ProphetXBet, BetStatus
         
         for attempt in range(max_retries):
             try:
-                external_id = f"{managed_event.event_id}_{instruction.line_id}_{int(time.time())}_{attempt}"
+                external_id = self._new_external_id(managed_event.event_id, instruction.line_id)
                 
                 # Place bet on ProphetX
                 result = await prophetx_service.place_bet(
@@ -441,6 +445,8 @@ class MarketMakerService:
                     bet = ProphetXBet(
                         bet_id=result.get("bet_id"),
                         external_id=external_id,
+                        event_id=managed_event.event_id,
+                        market_type=instruction.market_type,
                         line_id=instruction.line_id,
                         selection_name=instruction.selection_name,
                         odds=instruction.odds,
@@ -452,7 +458,7 @@ class MarketMakerService:
                     )
                     
                     # Store bet and update tracking
-                    self.all_bets[external_id] = bet
+                    self._track_bet(bet)
                     self.position_tracker.record_new_bet(instruction.line_id, bet_amount, external_id)
                     
                     return True
@@ -616,7 +622,8 @@ class MarketMakerService:
                 
                 # Check for odds movement
                 if abs(odds - last_odds[market_type][outcome_name]) >= 5:  # 5 point movement
-                    print(f"📊 Odds change detected: {outcome_name} {last_odds[market_type][outcome_name]:+d} → {odds:+d}")
+                    label = outcome_name if isinstance(outcome_name, str) else "_".join(map(str, outcome_name))
+                    print(f"📊 Odds change detected: {label} {last_odds[market_type][outcome_name]:+d} → {odds:+d}")
                     odds_changed = True
                     break
         
@@ -629,7 +636,7 @@ class MarketMakerService:
         
         return odds_changed
     
-    def _extract_odds_signature(self, odds_event: ProcessedEvent) -> Dict[str, Dict[str, int]]:
+    def _extract_odds_signature(self, odds_event: ProcessedEvent) -> Dict[str, Dict[Any, int]]:
         """Extract odds signature for change detection"""
         signature = {}
         
@@ -641,13 +648,13 @@ class MarketMakerService:
         
         if odds_event.spreads:
             signature['spreads'] = {
-                f"{outcome.name}_{outcome.point}": outcome.american_odds 
+                (outcome.name, outcome.point): outcome.american_odds 
                 for outcome in odds_event.spreads.outcomes
             }
         
         if odds_event.totals:
             signature['totals'] = {
-                f"{outcome.name}_{outcome.point}": outcome.american_odds 
+                (outcome.name, outcome.point): outcome.american_odds 
                 for outcome in odds_event.totals.outcomes
             }
         
@@ -702,9 +709,7 @@ class MarketMakerService:
         """Place a bet for a specific line with incremental tracking - ENHANCED VERSION"""
         try:
             if not self.settings.dry_run_mode:
-                from app.services.prophetx_service import prophetx_service
-                
-                external_id = f"{managed_event.event_id}_{instruction.line_id}_{int(time.time())}"
+                external_id = self._new_external_id(managed_event.event_id, instruction.line_id)
                 
                 # ACTUALLY place the bet on ProphetX (not dry run anymore!)
                 result = await prophetx_service.place_bet(
@@ -719,6 +724,8 @@ class MarketMakerService:
                     bet = ProphetXBet(
                         bet_id=result.get("bet_id"),
                         external_id=external_id,
+                        event_id=managed_event.event_id,
+                        market_type=instruction.market_type,
                         line_id=instruction.line_id,
                         selection_name=instruction.selection_name,
                         odds=instruction.odds,
@@ -730,7 +737,7 @@ class MarketMakerService:
                     )
                     
                     # Store bet and update tracking
-                    self.all_bets[external_id] = bet
+                    self._track_bet(bet)
                     self.position_tracker.record_new_bet(instruction.line_id, bet_amount, external_id)
                     
                     print(f"💰 ✅ REAL BET PLACED: {instruction.selection_name} {instruction.odds:+d} for ${bet_amount:.2f}")
@@ -740,10 +747,12 @@ class MarketMakerService:
                     return False
             else:
                 # DRY RUN mode (your existing logic)
-                external_id = f"{managed_event.event_id}_{instruction.line_id}_{int(time.time())}"
+                external_id = self._new_external_id(managed_event.event_id, instruction.line_id)
                 
                 bet = ProphetXBet(
                     external_id=external_id,
+                    event_id=managed_event.event_id,
+                    market_type=instruction.market_type,
                     line_id=instruction.line_id,
                     selection_name=instruction.selection_name,
                     odds=instruction.odds,
@@ -755,7 +764,7 @@ class MarketMakerService:
                 )
                 
                 # Store bet and update tracking
-                self.all_bets[external_id] = bet
+                self._track_bet(bet)
                 self.position_tracker.record_new_bet(instruction.line_id, bet_amount, external_id)
                 
                 mode_indicator = '[DRY RUN] '
@@ -766,6 +775,16 @@ class MarketMakerService:
             print(f"❌ Error placing bet for {instruction.selection_name}: {e}")
             return False
     
+    def _new_external_id(self, event_id: str, line_id: str) -> str:
+        """Unique external_id for a new bet: event, line, placement second and a process-wide sequence number"""
+        return f"{event_id}_{line_id}_{int(time.time())}_{next(self._bet_sequence)}"
+    
+    def _track_bet(self, bet: ProphetXBet):
+        """Store a newly placed bet and index it by event and market"""
+        self.all_bets[bet.external_id] = bet
+        if bet.event_id:
+            self.bets_by_event_market.setdefault((bet.event_id, bet.market_type), set()).add(bet.external_id)
+    
     async def _cancel_line_bets(self, line_id: str):
         """Cancel all active bets for a specific line (when odds change)"""
         cancelled_count = 0
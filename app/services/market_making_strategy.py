@@ -77,6 +77,7 @@ class BettingInstruction:
     total_payout: float = 0.0  # Total payout (stake + net winnings) - for arbitrage verification
     gross_winnings: float = 0.0  # Gross winnings before commission
     commission_paid: float = 0.0  # Commission amount paid on winnings
+    market_type: Optional[str] = None  # Odds API market key (h2h, spreads, totals)
     
 @dataclass
 class ArbitrageCalculation:
@@ -409,7 +410,8 @@ class MarketMakingStrategy:
         pinnacle_odds: int,
         outcome_name: str,
         position_limits: PositionLimits,
-        is_plus_side: bool
+        is_plus_side: bool,
+        market_type: Optional[str] = None
     ) -> Optional[BettingInstruction]:
         """
         Create a betting instruction using true arbitrage sizing with exact payout calculation
@@ -421,6 +423,7 @@ class MarketMakingStrategy:
             outcome_name: What we're offering to users (e.g., "Mets -118")
             position_limits: Position sizing with true arbitrage amounts
             is_plus_side: Whether OUR BET is the positive odds side
+            market_type: Odds API market key the line belongs to (h2h, spreads, totals)
         """
         # Step 1: Our bet odds are exact opposite of Pinnacle
         our_bet_odds = self.calculate_exact_hedge_odds(pinnacle_odds)
@@ -472,7 +475,8 @@ class MarketMakingStrategy:
             # NEW: Add payout tracking fields
             total_payout=total_payout,
             gross_winnings=gross_winnings,
-            commission_paid=commission
+            commission_paid=commission,
+            market_type=market_type
         )
         
         return instruction
@@ -724,7 +728,8 @@ class MarketMakingStrategy:
                     pinnacle_odds=plus_offer_outcome.american_odds,  # What we offer users
                     outcome_name=f"{plus_offer_outcome.name} {plus_offer_outcome.american_odds:+d}",
                     position_limits=limits,
-                    is_plus_side=True
+                    is_plus_side=True,
+                    market_type=market_type
                 )
                 if plus_instruction:
                     instructions.append(plus_instruction)
@@ -742,7 +747,8 @@ class MarketMakingStrategy:
                     pinnacle_odds=minus_offer_outcome.american_odds,  # What we offer users
                     outcome_name=f"{minus_offer_outcome.name} {minus_offer_outcome.american_odds:+d}",
                     position_limits=limits,
-                    is_plus_side=False
+                    is_plus_side=False,
+                    market_type=market_type
                 )
                 if minus_instruction:
                     instructions.append(minus_instruction)
@@ -4,10 +4,17 @@ Market Matching Service
 Matches markets and outcomes between Odds API and ProphetX
 """
 
+import asyncio
+import logging
 import re
+import sys
+from functools import lru_cache
 from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any, Tuple
-from difflib import SequenceMatcher
+
+import numpy as np
+import orjson
+from rapidfuzz import fuzz, process
 
 from app.models.odds_models import ProcessedEvent, ProcessedMarket, ProcessedOutcome
 from app.services.prophetx_events_service import ProphetXEvent
@@ -17,9 +24,32 @@ from app.services.event_matching_service import EventMatch
 # Import the new market models
 from app.models.prophetx_market_models import (
     ProphetXLine, ProphetXRawMarket, ProphetXEventMarkets,
-    MarketMatchResult, OutcomeMapping, EventMarketsMatch
+    MarketMatchResult, OutcomeMapping, OutcomeMappingDict, EventMarketsMatch
 )
 
+logger = logging.getLogger(__name__)
+
+# ProphetX market category that holds moneyline/spread/total markets
+GAME_LINES_CATEGORY = 'Game Lines'
+
+def best_spread_candidate(
+    target_point: float,
+    points: np.ndarray,
+    sim_scores: np.ndarray,
+    tol: float = 0.1,
+    min_similarity: float = 0.8
+) -> int:
+    """
+    Index of the highest-similarity line whose point is within tol of target_point
+    
+    Ties go to the first line, matching the original linear scan. Returns -1 when
+    no line passes both the point tolerance and the similarity threshold.
+    """
+    eligible = (np.abs(points - target_point) <= tol) & (sim_scores >= min_similarity)
+    if not eligible.any():
+        return -1
+    return int(np.argmax(np.where(eligible, sim_scores, -np.inf)))
+
 class MarketMatchingService:
     """Service for matching markets between Odds API and ProphetX"""
     
@@ -127,39 +157,60 @@ class MarketMatchingService:
             # Rockies variations
             r'\b(rockies|colorado rockies)\b': 'rockies'
         }
+        
+        # Precompiled normalization regexes (compiled once, not per call).
+        # All team patterns are unioned into one alternation so each name is
+        # scanned a single time; the named group that matched picks the replacement.
+        self._team_name_replacements = {
+            f"team{i}": replacement
+            for i, replacement in enumerate(self.team_name_patterns.values())
+        }
+        self._team_name_regex = re.compile(
+            '|'.join(f"(?P<team{i}>{pattern})" for i, pattern in enumerate(self.team_name_patterns)),
+            re.IGNORECASE
+        )
+        self._whitespace_regex = re.compile(r'\s+')
+        self._filler_words_regex = re.compile(r'\b(the|team)\b')
+        
+        # Normalization is deterministic per name, so memoize it for this instance
+        self._normalize_selection_name = lru_cache(maxsize=8192)(self._normalize_selection_name)
+        
+        # Similarity scores keyed on (sorted normalized pair, score cutoff), FIFO-evicted
+        self._similarity_cache: Dict[Tuple[str, str, float], float] = {}
+        self._similarity_cache_max_size = 50000
     
-    async def fetch_prophetx_markets(self, event_id: int) -> Optional[ProphetXEventMarkets]:
+    async def fetch_prophetx_markets(self, event_id: int, now: Optional[datetime] = None) -> Optional[ProphetXEventMarkets]:
         """
         Fetch and parse ProphetX markets for a specific event
         
         Args:
             event_id: ProphetX event ID
+            now: Timestamp to stamp the parsed markets with (defaults to current UTC time)
             
         Returns:
             Parsed ProphetX markets or None if failed
         """
-        print(f"📊 Fetching ProphetX markets for event {event_id}...")
+        logger.info("📊 Fetching ProphetX markets for event %s...", event_id)
         
         try:
             headers = await prophetx_service.get_auth_headers()
             url = f"{prophetx_service.base_url}/partner/v2/mm/get_markets"
             params = {"event_id": event_id}
             
-            import requests
-            response = requests.get(url, headers=headers, params=params)
+            response = await prophetx_service.request("GET", url, headers=headers, params=params)
             
             if response.status_code == 200:
-                raw_data = response.json()
+                raw_data = orjson.loads(response.content)
                 
                 # Parse the ProphetX market response
-                event_markets = self._parse_prophetx_markets(event_id, raw_data)
+                event_markets = self._parse_prophetx_markets(event_id, raw_data, now)
                 
                 if event_markets:
-                    print(f"✅ Found {len(event_markets.markets)} markets for event {event_id}")
+                    logger.info("✅ Found %d markets for event %s", len(event_markets.markets), event_id)
                     
                     # Log market summary
                     for market in event_markets.markets:
-                        print(f"   📈 {market.market_type}: {len(market.lines)} lines")
+                        logger.info("   📈 %s: %d lines", market.market_type, len(market.lines))
                     
                     # Cache the results
                     self.markets_cache[event_id] = event_markets
@@ -167,15 +218,20 @@ class MarketMatchingService:
                 return event_markets
                 
             else:
-                print(f"❌ Error fetching markets for event {event_id}: HTTP {response.status_code}")
-                print(f"   Response: {response.text}")
+                logger.error("❌ Error fetching markets for event %s: HTTP %s", event_id, response.status_code)
+                logger.error("   Response: %s", response.text)
                 return None
                 
         except Exception as e:
-            print(f"❌ Exception fetching markets for event {event_id}: {e}")
+            logger.error("❌ Exception fetching markets for event %s: %s", event_id, e)
             return None
     
-    def _parse_prophetx_markets(self, event_id: int, raw_data: Dict[str, Any]) -> Optional[ProphetXEventMarkets]:
+    def _parse_prophetx_markets(
+        self,
+        event_id: int,
+        raw_data: Dict[str, Any],
+        now: Optional[datetime] = None
+    ) -> Optional[ProphetXEventMarkets]:
         """
         Parse raw ProphetX API response into our market models
         
@@ -202,26 +258,26 @@ class MarketMatchingService:
             markets_data = data_section.get('markets', [])
             
             if not markets_data:
-                print(f"⚠️  No markets found in ProphetX response for event {event_id}")
+                logger.warning("⚠️  No markets found in ProphetX response for event %s", event_id)
                 return None
             
-            print(f"📊 Found {len(markets_data)} raw markets for event {event_id}")
+            logger.debug("📊 Found %d raw markets for event %s", len(markets_data), event_id)
             
             # **NEW**: Filter for Game Lines only
-            game_line_markets = []
-            for market_data in markets_data:
-                category_name = market_data.get('category_name', '')
-                if category_name == 'Game Lines':
-                    game_line_markets.append(market_data)
-                    print(f"   ✅ Found Game Line market: {market_data.get('name', 'Unknown')} (ID: {market_data.get('id')})")
-                else:
-                    print(f"   ⏭️  Skipping non-Game Line market: {market_data.get('name', 'Unknown')} (Category: {category_name})")
+            game_line_markets = [
+                market_data for market_data in markets_data
+                if market_data.get('category_name') == GAME_LINES_CATEGORY
+            ]
+            logger.debug(
+                "   ⏭️  Skipping %d non-Game Line markets",
+                len(markets_data) - len(game_line_markets)
+            )
             
             if not game_line_markets:
-                print(f"⚠️  No Game Lines markets found for event {event_id}")
+                logger.warning("⚠️  No Game Lines markets found for event %s", event_id)
                 return None
             
-            print(f"🎯 Processing {len(game_line_markets)} Game Lines markets...")
+            logger.debug("🎯 Processing %d Game Lines markets...", len(game_line_markets))
             
             parsed_markets = []
             
@@ -231,20 +287,13 @@ class MarketMatchingService:
                     market = self._parse_single_market(event_id, market_data)
                     if market:
                         parsed_markets.append(market)
-                        print(f"   ✅ Parsed market: {market.market_type} ({len(market.lines)} lines)")
-                        
-                        # Log each line for debugging
-                        for line in market.lines:
-                            odds_str = f"{line.odds:+d}" if line.odds is not None else "null"
-                            point_str = f" @ {line.point}" if line.point else ""
-                            print(f"      📝 {line.selection_name}: {odds_str}{point_str} (line_id: {line.line_id})")
                         
                 except Exception as e:
-                    print(f"⚠️  Error parsing market {market_data.get('id', 'unknown')}: {e}")
+                    logger.warning("⚠️  Error parsing market %s: %s", market_data.get('id', 'unknown'), e)
                     continue
             
             if not parsed_markets:
-                print(f"⚠️  No valid Game Lines markets parsed for event {event_id}")
+                logger.warning("⚠️  No valid Game Lines markets parsed for event %s", event_id)
                 return None
             
             # Create event markets object
@@ -252,15 +301,15 @@ class MarketMatchingService:
                 event_id=event_id,
                 event_name=f"Event {event_id}",
                 markets=parsed_markets,
-                last_updated=datetime.now(timezone.utc),
+                last_updated=now or datetime.now(timezone.utc),
                 raw_response=raw_data
             )
             
-            print(f"🎉 Successfully parsed {len(parsed_markets)} Game Lines markets for event {event_id}")
+            logger.debug("🎉 Successfully parsed %d Game Lines markets for event %s", len(parsed_markets), event_id)
             return event_markets
             
         except Exception as e:
-            print(f"❌ Error parsing ProphetX markets response: {e}")
+            logger.error("❌ Error parsing ProphetX markets response: %s", e)
             return None
     
     def _parse_single_market(self, event_id: int, market_data: Dict[str, Any]) -> Optional[ProphetXRawMarket]:
@@ -278,8 +327,6 @@ class MarketMatchingService:
             market_type = market_data.get('type', market_data.get('sub_type', 'unknown'))
             status = market_data.get('status', 'active')
             
-            print(f"   🔧 Parsing market {market_id}: {market_name} ({market_type})")
-            
             parsed_lines = []
             
             # Check if this market has market_lines (complex market)
@@ -299,15 +346,24 @@ class MarketMatchingService:
             
             # **CHANGED**: Include ALL lines, but separate available vs unavailable
             all_lines = parsed_lines
-            available_lines = [line for line in parsed_lines if line.odds is not None and line.odds != 0]
-            
-            print(f"      📊 Total lines: {len(all_lines)}, Available: {len(available_lines)}")
             
             # **CHANGED**: Return market if it has ANY lines (not just available ones)
             if not all_lines:
-                print(f"      ❌ No lines found for market {market_id}")
+                logger.debug("      ❌ No lines found for market %s: %s (%s)", market_id, market_name, market_type)
                 return None
             
+            # One digest line per market; skip building it unless debug is enabled
+            if logger.isEnabledFor(logging.DEBUG):
+                available_lines = [line for line in all_lines if line.odds is not None and line.odds != 0]
+                summary = ', '.join(
+                    f"{line.selection_name}{f' {line.point:+g}' if line.point else ''}={line.odds:+d}"
+                    for line in available_lines
+                )
+                logger.debug(
+                    "   ✅ Parsed market %s: %s (%s) - %d lines, %d available: %s",
+                    market_id, market_name, market_type, len(all_lines), len(available_lines), summary
+                )
+            
             # **CHANGED**: Use all_lines instead of just available_lines
             market = ProphetXRawMarket(
                 market_id=market_id,
@@ -321,7 +377,7 @@ class MarketMatchingService:
             return market
             
         except Exception as e:
-            print(f"❌ Error parsing single market: {e}")
+            logger.error("❌ Error parsing single market: %s", e)
             return None
     
     def _parse_market_line(self, line_data: Dict[str, Any]) -> List[ProphetXLine]:
@@ -333,7 +389,7 @@ class MarketMatchingService:
             return self._parse_selections(selections, line_point)
             
         except Exception as e:
-            print(f"❌ Error parsing market line: {e}")
+            logger.error("❌ Error parsing market line: %s", e)
             return []
     
     def _parse_selections(self, selections: List[List[Dict]], default_point: float = 0) -> List[ProphetXLine]:
@@ -364,7 +420,7 @@ class MarketMatchingService:
             return parsed_lines
             
         except Exception as e:
-            print(f"❌ Error parsing selections: {e}")
+            logger.error("❌ Error parsing selections: %s", e)
             return []
     
     def _parse_single_selection(self, selection_data: Dict[str, Any], default_point: float = 0) -> Optional[ProphetXLine]:
@@ -400,7 +456,7 @@ class MarketMatchingService:
             
             line = ProphetXLine(
                 line_id=str(line_id),
-                selection_name=str(name),
+                selection_name=sys.intern(str(name)),
                 odds=odds_value,
                 point=float(point) if point != 0 else None,
                 status=status
@@ -409,7 +465,7 @@ class MarketMatchingService:
             return line
             
         except Exception as e:
-            print(f"❌ Error parsing single selection: {e}")
+            logger.error("❌ Error parsing single selection: %s", e)
             return None
     
     def _normalize_market_type(self, market_type: str) -> str:
@@ -437,10 +493,13 @@ class MarketMatchingService:
         odds_event = event_match.odds_api_event
         prophetx_event = event_match.prophetx_event
         
-        print(f"🎯 Matching markets for: {odds_event.display_name}")
+        logger.info("🎯 Matching markets for: %s", odds_event.display_name)
+        
+        # One timestamp for the whole matching operation
+        now = datetime.now(timezone.utc)
         
         # Fetch ProphetX markets
-        prophetx_markets = await self.fetch_prophetx_markets(prophetx_event.event_id)
+        prophetx_markets = await self.fetch_prophetx_markets(prophetx_event.event_id, now)
         
         if not prophetx_markets:
             # No ProphetX markets available
@@ -452,39 +511,11 @@ class MarketMatchingService:
                 overall_confidence=0.0,
                 ready_for_trading=False,
                 issues=["Could not fetch ProphetX markets"],
-                matched_at=datetime.now(timezone.utc)
+                matched_at=now
             )
         
-        # Match each market type
-        market_matches = []
-        
-        # Match moneyline
-        if odds_event.moneyline:
-            match_result = await self._match_moneyline_market(
-                odds_event.moneyline, 
-                prophetx_markets,
-                odds_event.home_team,
-                odds_event.away_team
-            )
-            market_matches.append(match_result)
-        
-        # Match spreads
-        if odds_event.spreads:
-            match_result = await self._match_spreads_market(
-                odds_event.spreads,
-                prophetx_markets,
-                odds_event.home_team,
-                odds_event.away_team
-            )
-            market_matches.append(match_result)
-        
-        # Match totals
-        if odds_event.totals:
-            match_result = await self._match_totals_market(
-                odds_event.totals,
-                prophetx_markets
-            )
-            market_matches.append(match_result)
+        # Match each market type in a single pass over the ProphetX markets
+        market_matches = await self._match_all_markets(odds_event, prophetx_markets)
         
         # Calculate overall assessment
         successful_matches = [m for m in market_matches if m.is_matched]
@@ -511,22 +542,22 @@ class MarketMatchingService:
         # ✅ ENHANCED: Separate reporting of blocking vs opportunity issues
         all_issues = blocking_issues + market_making_opportunities
         
-        print(f"📊 Market matching summary:")
-        print(f"   Successful matches: {len(successful_matches)}/{len(market_matches)}")
-        print(f"   Overall confidence: {overall_confidence:.3f}")
-        print(f"   Blocking issues: {len(blocking_issues)}")
-        print(f"   Market making opportunities: {len(market_making_opportunities)}")
-        print(f"   Ready for trading: {ready_for_trading}")
+        logger.info("📊 Market matching summary:")
+        logger.info("   Successful matches: %d/%d", len(successful_matches), len(market_matches))
+        logger.info("   Overall confidence: %.3f", overall_confidence)
+        logger.info("   Blocking issues: %d", len(blocking_issues))
+        logger.info("   Market making opportunities: %d", len(market_making_opportunities))
+        logger.info("   Ready for trading: %s", ready_for_trading)
         
         if market_making_opportunities:
-            print(f"🟡 Market making opportunities found:")
+            logger.info("🟡 Market making opportunities found:")
             for opp in market_making_opportunities:
-                print(f"     {opp}")
+                logger.info("     %s", opp)
         
         if blocking_issues:
-            print(f"❌ Blocking issues:")
+            logger.warning("❌ Blocking issues:")
             for issue in blocking_issues:
-                print(f"     {issue}")
+                logger.warning("     %s", issue)
         
         return EventMarketsMatch(
             odds_api_event_id=odds_event.event_id,
@@ -536,20 +567,96 @@ class MarketMatchingService:
             overall_confidence=overall_confidence,
             ready_for_trading=ready_for_trading,
             issues=all_issues,
-            matched_at=datetime.now(timezone.utc)
+            matched_at=now
         )
     
+    async def match_all(
+        self,
+        event_matches: List[EventMatch],
+        concurrency: int = 16,
+        return_exceptions: bool = False
+    ) -> List[EventMarketsMatch]:
+        """
+        Match markets for a batch of events concurrently
+        
+        Args:
+            event_matches: Confirmed event matches to run market matching for
+            concurrency: Maximum number of events matched at the same time
+            return_exceptions: Return per-event exceptions in the result list
+                instead of raising the first one
+            
+        Returns:
+            Market match results in the same order as event_matches
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def match_with_semaphore(event_match: EventMatch) -> EventMarketsMatch:
+            async with semaphore:
+                return await self.match_event_markets(event_match)
+        
+        return await asyncio.gather(
+            *(match_with_semaphore(event_match) for event_match in event_matches),
+            return_exceptions=return_exceptions
+        )
+    
+    async def _match_all_markets(
+        self,
+        odds_event: ProcessedEvent,
+        prophetx_markets: ProphetXEventMarkets
+    ) -> List[MarketMatchResult]:
+        """
+        Match moneyline, spreads and totals for an event in one pass
+        
+        Looks up the market of each type once through the by_type index,
+        then matches every Odds API market the event has against it.
+        """
+        px_markets_by_type = prophetx_markets.by_type
+        
+        market_matches = []
+        
+        # Match moneyline
+        if odds_event.moneyline:
+            market_matches.append(await self._match_moneyline_market(
+                odds_event.moneyline,
+                prophetx_markets,
+                odds_event.home_team,
+                odds_event.away_team,
+                px_market=px_markets_by_type.get("moneyline")
+            ))
+        
+        # Match spreads
+        if odds_event.spreads:
+            market_matches.append(await self._match_spreads_market(
+                odds_event.spreads,
+                prophetx_markets,
+                odds_event.home_team,
+                odds_event.away_team,
+                px_market=px_markets_by_type.get("spread")
+            ))
+        
+        # Match totals
+        if odds_event.totals:
+            market_matches.append(await self._match_totals_market(
+                odds_event.totals,
+                prophetx_markets,
+                px_market=px_markets_by_type.get("total")
+            ))
+        
+        return market_matches
+    
     async def _match_moneyline_market(
         self, 
         odds_api_market: ProcessedMarket,
         prophetx_markets: ProphetXEventMarkets,
         home_team: str,
-        away_team: str
+        away_team: str,
+        px_market: Optional[ProphetXRawMarket] = None
     ) -> MarketMatchResult:
         """Match moneyline market between platforms - INCLUDE INACTIVE LINES"""
         
         # Find ProphetX moneyline market
-        px_market = prophetx_markets.get_moneyline_market()
+        if px_market is None:
+            px_market = prophetx_markets.get_moneyline_market()
         
         if not px_market:
             return MarketMatchResult(
@@ -559,40 +666,25 @@ class MarketMatchingService:
                 issues=["No moneyline market found on ProphetX"]
             )
         
-        # Match outcomes
+        # Match outcomes - resolve every outcome against the lines in one batch
         outcome_mappings = []
         
-        for odds_outcome in odds_api_market.outcomes:
-            # Find matching ProphetX line
-            px_line = self._find_matching_line(
-                odds_outcome.name,
-                px_market.lines,
-                home_team,
-                away_team
-            )
-            
+        matched_lines = self._find_matching_lines(
+            [odds_outcome.name for odds_outcome in odds_api_market.outcomes],
+            px_market.lines,
+            px_market.get_normalized_names(self._normalize_selection_name)
+        )
+        
+        for odds_outcome, px_line in zip(odds_api_market.outcomes, matched_lines):
             if px_line:
-                mapping = OutcomeMapping(
-                    odds_api_outcome_name=odds_outcome.name,
-                    odds_api_odds=odds_outcome.american_odds,
-                    prophetx_line_id=px_line.line_id,
-                    prophetx_selection_name=px_line.selection_name,
-                    prophetx_odds=px_line.american_odds,  # Will be 0 for inactive lines
-                    confidence_score=self._calculate_name_similarity(odds_outcome.name, px_line.selection_name),
-                    name_similarity=self._calculate_name_similarity(odds_outcome.name, px_line.selection_name)
-                )
-                
-                # Convert to dict and add status information
-                mapping_dict = mapping.dict()
-                mapping_dict['prophetx_line_active'] = px_line.is_active
-                mapping_dict['prophetx_line_status'] = px_line.status
-                if not px_line.is_active:
-                    mapping_dict['note'] = 'Line available for betting but no current liquidity'
-                    mapping_dict['market_making_opportunity'] = True
-                else:
-                    mapping_dict['market_making_opportunity'] = False
-                
-                outcome_mappings.append(mapping_dict)
+                name_similarity = self._calculate_name_similarity(odds_outcome.name, px_line.selection_name)
+                outcome_mappings.append(self._build_outcome_mapping(
+                    odds_outcome,
+                    px_line,
+                    confidence_score=name_similarity,
+                    name_similarity=name_similarity,
+                    include_points=False
+                ))
         
         # Assess match quality
         match_status = "matched" if len(outcome_mappings) == len(odds_api_market.outcomes) else "partial"
@@ -618,11 +710,13 @@ class MarketMatchingService:
         odds_api_market: ProcessedMarket,
         prophetx_markets: ProphetXEventMarkets,
         home_team: str,
-        away_team: str
+        away_team: str,
+        px_market: Optional[ProphetXRawMarket] = None
     ) -> MarketMatchResult:
         """Match spreads market between platforms - INCLUDE INACTIVE LINES"""
         
-        px_market = prophetx_markets.get_spread_market()
+        if px_market is None:
+            px_market = prophetx_markets.get_spread_market()
         
         if not px_market:
             return MarketMatchResult(
@@ -639,36 +733,20 @@ class MarketMatchingService:
             px_line = self._find_matching_spread_line(
                 odds_outcome.name,
                 odds_outcome.point,
-                px_market.lines,
+                px_market,
                 home_team,
                 away_team
             )
             
             if px_line:
-                mapping = OutcomeMapping(
-                    odds_api_outcome_name=odds_outcome.name,
-                    odds_api_odds=odds_outcome.american_odds,
-                    odds_api_point=odds_outcome.point,
-                    prophetx_line_id=px_line.line_id,
-                    prophetx_selection_name=px_line.selection_name,
-                    prophetx_odds=px_line.american_odds,  # Will be 0 for inactive lines
-                    prophetx_point=px_line.point,
-                    confidence_score=self._calculate_spread_match_confidence(odds_outcome, px_line),
-                    name_similarity=self._calculate_name_similarity(odds_outcome.name, px_line.selection_name),
+                name_similarity = self._calculate_name_similarity(odds_outcome.name, px_line.selection_name)
+                outcome_mappings.append(self._build_outcome_mapping(
+                    odds_outcome,
+                    px_line,
+                    confidence_score=self._calculate_spread_match_confidence(odds_outcome, px_line, name_similarity),
+                    name_similarity=name_similarity,
                     point_match=abs((odds_outcome.point or 0) - (px_line.point or 0)) <= 0.1
-                )
-                
-                # Convert to dict and add status information
-                mapping_dict = mapping.dict()
-                mapping_dict['prophetx_line_active'] = px_line.is_active
-                mapping_dict['prophetx_line_status'] = px_line.status
-                if not px_line.is_active:
-                    mapping_dict['note'] = 'Line available for betting but no current liquidity'
-                    mapping_dict['market_making_opportunity'] = True
-                else:
-                    mapping_dict['market_making_opportunity'] = False
-                
-                outcome_mappings.append(mapping_dict)
+                ))
         
         match_status = "matched" if len(outcome_mappings) == len(odds_api_market.outcomes) else "partial"
         confidence = sum(m["confidence_score"] for m in outcome_mappings) / len(outcome_mappings) if outcome_mappings else 0
@@ -691,11 +769,13 @@ class MarketMatchingService:
     async def _match_totals_market(
         self,
         odds_api_market: ProcessedMarket,
-        prophetx_markets: ProphetXEventMarkets
+        prophetx_markets: ProphetXEventMarkets,
+        px_market: Optional[ProphetXRawMarket] = None
     ) -> MarketMatchResult:
         """Match totals (over/under) market between platforms - INCLUDE INACTIVE LINES"""
         
-        px_market = prophetx_markets.get_total_market()
+        if px_market is None:
+            px_market = prophetx_markets.get_total_market()
         
         if not px_market:
             return MarketMatchResult(
@@ -707,39 +787,27 @@ class MarketMatchingService:
         
         outcome_mappings = []
         
+        # Index the total lines once for all outcomes of this market
+        totals_index = self._build_totals_index(px_market.lines)
+        
         for odds_outcome in odds_api_market.outcomes:
             # For totals, match "Over"/"Under" with the same point value
             px_line = self._find_matching_total_line(
                 odds_outcome.name,
                 odds_outcome.point,
-                px_market.lines
+                px_market,
+                totals_index
             )
             
             if px_line:
-                mapping = OutcomeMapping(
-                    odds_api_outcome_name=odds_outcome.name,
-                    odds_api_odds=odds_outcome.american_odds,
-                    odds_api_point=odds_outcome.point,
-                    prophetx_line_id=px_line.line_id,
-                    prophetx_selection_name=px_line.selection_name,
-                    prophetx_odds=px_line.american_odds,  # Will be 0 for inactive lines
-                    prophetx_point=px_line.point,
-                    confidence_score=self._calculate_total_match_confidence(odds_outcome, px_line),
-                    name_similarity=self._calculate_name_similarity(odds_outcome.name, px_line.selection_name),
+                name_similarity = self._calculate_name_similarity(odds_outcome.name, px_line.selection_name)
+                outcome_mappings.append(self._build_outcome_mapping(
+                    odds_outcome,
+                    px_line,
+                    confidence_score=self._calculate_total_match_confidence(odds_outcome, px_line, name_similarity),
+                    name_similarity=name_similarity,
                     point_match=abs((odds_outcome.point or 0) - (px_line.point or 0)) <= 0.1
-                )
-                
-                # Convert to dict and add status information
-                mapping_dict = mapping.dict()
-                mapping_dict['prophetx_line_active'] = px_line.is_active
-                mapping_dict['prophetx_line_status'] = px_line.status
-                if not px_line.is_active:
-                    mapping_dict['note'] = 'Line available for betting but no current liquidity'
-                    mapping_dict['market_making_opportunity'] = True
-                else:
-                    mapping_dict['market_making_opportunity'] = False
-                
-                outcome_mappings.append(mapping_dict)
+                ))
         
         # ✅ UPDATED: Consider it a successful match even if lines are inactive
         # The presence of valid line_ids means we can place bets
@@ -761,38 +829,118 @@ class MarketMatchingService:
             issues=blocking_issues  # This will be filtered in match_event_markets
         )
     
+    def _build_outcome_mapping(
+        self,
+        odds_outcome: ProcessedOutcome,
+        px_line: ProphetXLine,
+        confidence_score: float,
+        name_similarity: float,
+        point_match: bool = True,
+        include_points: bool = True
+    ) -> OutcomeMappingDict:
+        """
+        Build the outcome mapping dict for a matched ProphetX line
+        
+        Produces the same keys as OutcomeMapping(...).dict() plus the line status
+        fields as a single dict literal, without a Pydantic model per outcome.
+        """
+        is_active = px_line.is_active
+        mapping_dict: OutcomeMappingDict = {
+            'odds_api_outcome_name': odds_outcome.name,
+            'odds_api_odds': odds_outcome.american_odds,
+            'odds_api_point': odds_outcome.point if include_points else None,
+            'prophetx_line_id': px_line.line_id,
+            'prophetx_selection_name': px_line.selection_name,
+            'prophetx_odds': px_line.american_odds,  # Will be 0 for inactive lines
+            'prophetx_point': px_line.point if include_points else None,
+            'confidence_score': confidence_score,
+            'name_similarity': name_similarity,
+            'point_match': point_match,
+            'prophetx_line_active': is_active,
+            'prophetx_line_status': px_line.status,
+            'market_making_opportunity': not is_active,
+        }
+        if not is_active:
+            mapping_dict['note'] = 'Line available for betting but no current liquidity'
+        
+        return mapping_dict
+    
     def _find_matching_line(
         self,
         outcome_name: str,
-        prophetx_lines: List[ProphetXLine],
-        home_team: str,
-        away_team: str
+        prophetx_lines: List[ProphetXLine]
     ) -> Optional[ProphetXLine]:
         """Find matching ProphetX line for an outcome name - INCLUDE INACTIVE LINES"""
+        return self._find_matching_lines([outcome_name], prophetx_lines)[0]
+    
+    def _find_matching_lines(
+        self,
+        outcome_names: List[str],
+        prophetx_lines: List[ProphetXLine],
+        line_names: Optional[List[str]] = None
+    ) -> List[Optional[ProphetXLine]]:
+        """
+        Find the best matching ProphetX line for each outcome name in one batch
         
-        normalized_name = self._normalize_selection_name(outcome_name)
+        Line names are normalized once up front (or passed in precomputed as
+        line_names). An outcome whose normalized name equals a line name resolves
+        straight to that line; only the remaining outcomes are scored against
+        every line, with a rolling cutoff, to pick the best one.
+        """
+        # ✅ FIXED: Don't filter by is_active - we WANT inactive lines for market making!
+        # The line_id being present means it's available for betting
+        if line_names is None:
+            line_names = [self._normalize_selection_name(line.selection_name) for line in prophetx_lines]
+        
+        # Exact normalized name -> first line carrying it
+        exact_lines: Dict[str, ProphetXLine] = {}
+        for line, line_name in zip(prophetx_lines, line_names):
+            if line_name:
+                exact_lines.setdefault(line_name, line)
+        
+        best_matches: List[Optional[ProphetXLine]] = []
+        unresolved: List[Tuple[int, str]] = []
+        for normalized_name in map(self._normalize_selection_name, outcome_names):
+            # An exact match scores 1.0, which no other line can beat - skip fuzzy scoring
+            exact_line = exact_lines.get(normalized_name)
+            if exact_line is None:
+                unresolved.append((len(best_matches), normalized_name))
+            best_matches.append(exact_line)
+        
+        for row_index, normalized_name in unresolved:
+            best_index = self._best_name_match(normalized_name, line_names, score_cutoff=0.8)  # Require high similarity
+            if best_index >= 0:
+                best_matches[row_index] = prophetx_lines[best_index]
+        
+        return best_matches
+
+    def _build_totals_index(self, prophetx_lines: List[ProphetXLine]) -> Dict[Tuple[int, str], ProphetXLine]:
+        """
+        Index total lines by (point in tenths, side) for O(1) outcome lookups
         
-        best_match = None
-        best_similarity = 0.0
+        Side is 'over' and/or 'under' depending on which the selection name
+        contains; the first line in market order wins for each key.
+        """
+        totals_index: Dict[Tuple[int, str], ProphetXLine] = {}
         
         for line in prophetx_lines:
-            # ✅ FIXED: Don't filter by is_active - we WANT inactive lines for market making!
-            # The line_id being present means it's available for betting
+            if line.point is None:
+                continue
             
-            line_name = self._normalize_selection_name(line.selection_name)
-            similarity = self._calculate_name_similarity(normalized_name, line_name)
-            
-            if similarity > best_similarity and similarity >= 0.8:  # Require high similarity
-                best_similarity = similarity
-                best_match = line
+            line_name = line.selection_name.lower().strip()
+            point_key = int(round(line.point * 10))
+            for side in ("over", "under"):
+                if side in line_name:
+                    totals_index.setdefault((point_key, side), line)
         
-        return best_match
-
+        return totals_index
+    
     def _find_matching_total_line(
         self,
         outcome_name: str,
         point: Optional[float],
-        prophetx_lines: List[ProphetXLine]
+        px_market: ProphetXRawMarket,
+        totals_index: Optional[Dict[Tuple[int, str], ProphetXLine]] = None
     ) -> Optional[ProphetXLine]:
         """Find matching ProphetX total line - INCLUDE INACTIVE LINES"""
         
@@ -801,32 +949,37 @@ class MarketMatchingService:
         
         normalized_name = outcome_name.lower().strip()
         
-        for line in prophetx_lines:
+        # Direct hit on the same point and side
+        if totals_index is not None:
+            line = totals_index.get((int(round(point * 10)), normalized_name))
+            if line is not None:
+                return line
+        
+        # Only over/under outcomes can match a total line
+        if normalized_name not in ("over", "under"):
+            return None
+        
+        # Otherwise fall back to any line within the point tolerance
+        # Only lines in the matching point bucket can match
+        for line in px_market.get_lines_by_point(point, 0.1):
             # ✅ FIXED: Don't filter by is_active - inactive lines are OPPORTUNITIES!
             
-            line_name = line.selection_name.lower().strip()
-            
-            # Check both name and point match
-            name_match = (
-                (normalized_name == "over" and "over" in line_name) or
-                (normalized_name == "under" and "under" in line_name)
-            )
-            
-            point_match = (
-                line.point is not None and 
-                abs(line.point - point) <= 0.1
-            )
-            
-            if name_match and point_match:
+            # Check name match against our side only (point already matched)
+            if normalized_name in line.selection_name.lower():
                 return line
         
         return None
 
+    def _prepare_lines(self, px_market: ProphetXRawMarket) -> Tuple[np.ndarray, List[str]]:
+        """Points array and normalized names for a market's lines, built once per market"""
+        _, points, _, _ = px_market.to_soa()
+        return points, px_market.get_normalized_names(self._normalize_selection_name)
+    
     def _find_matching_spread_line(
         self,
         outcome_name: str,
         point: Optional[float],
-        prophetx_lines: List[ProphetXLine],
+        px_market: ProphetXRawMarket,
         home_team: str,
         away_team: str
     ) -> Optional[ProphetXLine]:
@@ -835,16 +988,22 @@ class MarketMatchingService:
         if point is None:
             return None
         
-        # First filter by point value (include both active and inactive)
-        point_matches = [line for line in prophetx_lines 
-                        if line.point is not None 
-                        and abs(line.point - point) <= 0.1]
+        # First filter by point value through the point bucket index (include both active and inactive)
+        candidate_indices = px_market.get_point_indices(point, 0.1)
         
-        if not point_matches:
+        if not candidate_indices:
             return None
         
-        # Then find best name match among point matches
-        return self._find_matching_line(outcome_name, point_matches, home_team, away_team)
+        # Then score names only for the point matches and pick the best one
+        points, line_names = self._prepare_lines(px_market)
+        candidate_names = [line_names[i] for i in candidate_indices]
+        sim_scores = np.zeros(len(points))
+        sim_scores[candidate_indices] = self._score_name_matrix(
+            [self._normalize_selection_name(outcome_name)], candidate_names, score_cutoff=0.8
+        )[0]
+        
+        best_index = best_spread_candidate(point, points, sim_scores)
+        return px_market.lines[best_index] if best_index >= 0 else None
     
     def _normalize_selection_name(self, name: str) -> str:
         """ENHANCED normalize selection name for comparison"""
@@ -854,26 +1013,65 @@ class MarketMatchingService:
         normalized = name.lower().strip()
         
         # Apply team name patterns (now includes Athletics!)
-        for pattern, replacement in self.team_name_patterns.items():
-            normalized = re.sub(pattern, replacement, normalized, flags=re.IGNORECASE)
+        normalized = self._team_name_regex.sub(self._replace_team_name, normalized)
         
         # Remove extra whitespace
-        normalized = re.sub(r'\s+', ' ', normalized)
+        normalized = self._whitespace_regex.sub(' ', normalized)
         
         # Remove common prefixes/suffixes that don't affect matching
-        normalized = re.sub(r'\b(the|team)\b', '', normalized)
+        normalized = self._filler_words_regex.sub('', normalized)
         normalized = normalized.strip()
         
-        return normalized
+        # Interned so repeated names share one object and compare by identity
+        return sys.intern(normalized)
     
-    def _calculate_name_similarity(self, name1: str, name2: str) -> float:
-        """ENHANCED calculate similarity between two names"""
+    def _replace_team_name(self, match: re.Match) -> str:
+        """Substitute a matched team name variation with its canonical name"""
+        return self._team_name_replacements[match.lastgroup]
+    
+    def _calculate_name_similarity(self, name1: str, name2: str, score_cutoff: float = 0.0) -> float:
+        """
+        ENHANCED calculate similarity between two names
+        
+        score_cutoff is the lowest score the caller will accept; fuzzy scores
+        below it come back as 0.0 so rapidfuzz can bail out early.
+        """
         if not name1 or not name2:
             return 0.0
-        
+
+        # Identical inputs - skip normalization and fuzzy matching entirely
+        if name1 == name2:
+            return 1.0
+
         norm1 = self._normalize_selection_name(name1)
         norm2 = self._normalize_selection_name(name2)
         
+        # The score is symmetric, so order the pair for the cache key
+        cache_key = (norm1, norm2, score_cutoff) if norm1 < norm2 else (norm2, norm1, score_cutoff)
+        similarity = self._similarity_cache.get(cache_key)
+        if similarity is None:
+            similarity = self._score_normalized_names(norm1, norm2, score_cutoff=score_cutoff)
+            
+            if len(self._similarity_cache) >= self._similarity_cache_max_size:
+                # Evict the oldest entry (dicts keep insertion order)
+                del self._similarity_cache[next(iter(self._similarity_cache))]
+            self._similarity_cache[cache_key] = similarity
+        
+        return similarity
+    
+    def _score_normalized_names(
+        self,
+        norm1: str,
+        norm2: str,
+        fuzzy_ratio: Optional[float] = None,
+        score_cutoff: float = 0.0
+    ) -> float:
+        """
+        Similarity rules for two already-normalized names
+        
+        fuzzy_ratio is a precomputed rapidfuzz ratio (0-1) for the pair; when
+        omitted it is computed here, only if no cheaper rule decides the score.
+        """
         # Exact match after normalization
         if norm1 == norm2:
             return 1.0
@@ -895,14 +1093,75 @@ class MarketMatchingService:
                 return min(0.9, jaccard + 0.3)  # Boost for any word match
         
         # Fuzzy string matching as fallback
-        similarity = SequenceMatcher(None, norm1, norm2).ratio()
+        if fuzzy_ratio is None:
+            # The ratio can never exceed 2*min(len)/(len1+len2), so lengths alone
+            # can rule the pair out before any character comparison
+            upper_bound = 2 * min(len(norm1), len(norm2)) / (len(norm1) + len(norm2))
+            if upper_bound < score_cutoff:
+                return 0.0
+            fuzzy_ratio = fuzz.ratio(norm1, norm2, score_cutoff=score_cutoff * 100) / 100.0
         
         # Lower the threshold for team names to be more permissive
-        return similarity
+        return fuzzy_ratio
     
-    def _calculate_spread_match_confidence(self, odds_outcome: ProcessedOutcome, px_line: ProphetXLine) -> float:
-        """Calculate confidence for spread match"""
-        name_similarity = self._calculate_name_similarity(odds_outcome.name, px_line.selection_name)
+    def _best_name_match(self, normalized_name: str, line_names: List[str], score_cutoff: float = 0.0) -> int:
+        """
+        Index of the first line name scoring highest against normalized_name, or -1
+        
+        The cutoff rises to the best score seen so far, so rapidfuzz can abandon
+        candidates that could no longer win; only a strictly better score
+        displaces the current best.
+        """
+        if not normalized_name:
+            return -1
+        
+        best_index = -1
+        best_score = score_cutoff
+        for j, line_name in enumerate(line_names):
+            if not line_name:
+                continue
+            score = self._score_normalized_names(normalized_name, line_name, score_cutoff=best_score)
+            if score > best_score or (best_index < 0 and score >= best_score):
+                best_index, best_score = j, score
+                if best_score >= 1.0:  # Nothing can beat an exact match
+                    break
+        
+        return best_index
+    
+    def _score_name_matrix(self, outcome_names: List[str], line_names: List[str], score_cutoff: float = 0.0) -> np.ndarray:
+        """
+        Similarity of every normalized outcome name against every normalized line name
+        
+        The fuzzy fallback for the whole matrix comes from one rapidfuzz cdist call;
+        the exact/containment/word-overlap rules are then applied per pair.
+        """
+        fuzzy_ratios = process.cdist(
+            outcome_names,
+            line_names,
+            scorer=fuzz.ratio,
+            score_cutoff=score_cutoff * 100,
+            dtype=np.float64
+        ) / 100.0
+        
+        scores = np.zeros(fuzzy_ratios.shape)
+        for i, outcome_name in enumerate(outcome_names):
+            if not outcome_name:
+                continue
+            for j, line_name in enumerate(line_names):
+                if line_name:
+                    scores[i, j] = self._score_normalized_names(outcome_name, line_name, fuzzy_ratios[i, j])
+        
+        return scores
+    
+    def _calculate_spread_match_confidence(
+        self,
+        odds_outcome: ProcessedOutcome,
+        px_line: ProphetXLine,
+        name_similarity: Optional[float] = None
+    ) -> float:
+        """Calculate confidence for spread match (reuses name_similarity when already computed)"""
+        if name_similarity is None:
+            name_similarity = self._calculate_name_similarity(odds_outcome.name, px_line.selection_name)
         
         # Point match
         point_match = 1.0
@@ -917,9 +1176,15 @@ class MarketMatchingService:
         
         return confidence
     
-    def _calculate_total_match_confidence(self, odds_outcome: ProcessedOutcome, px_line: ProphetXLine) -> float:
-        """Calculate confidence for total match"""
-        name_similarity = self._calculate_name_similarity(odds_outcome.name, px_line.selection_name)
+    def _calculate_total_match_confidence(
+        self,
+        odds_outcome: ProcessedOutcome,
+        px_line: ProphetXLine,
+        name_similarity: Optional[float] = None
+    ) -> float:
+        """Calculate confidence for total match (reuses name_similarity when already computed)"""
+        if name_similarity is None:
+            name_similarity = self._calculate_name_similarity(odds_outcome.name, px_line.selection_name)
         
         # Point match
         point_match = 1.0
@@ -6,14 +6,17 @@ Handles integration with The Odds API for getting Pinnacle odds
 
 import asyncio
 import aiohttp
+import heapq
+import numpy as np
+import orjson
 import time
 from datetime import datetime, timezone
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from fastapi import HTTPException
 
 from app.core.config import get_settings
 from app.models.odds_models import (
-    OddsApiRequest, OddsApiResponse, OddsEvent, Bookmaker, BookmakerMarket, BookmakerOutcome,
+    OddsApiRequest, OddsApiResponse,
     ProcessedEvent, ProcessedMarket, ProcessedOutcome, 
     SportKey, MarketType, Region, OddsFormat
 )
@@ -37,6 +40,26 @@ class OddsApiService:
         # Cache for recent data
         self.events_cache: Dict[str, ProcessedEvent] = {}
         self.cache_ttl = 300  # 5 minutes cache TTL
+        self._cache_expiry: Dict[str, float] = {}  # event_id -> monotonic expiry time
+        self._expiry_heap: List[Tuple[float, str]] = []  # (expiry, event_id), may hold superseded entries
+        
+        # Shared HTTP session (created lazily, reused for connection pooling)
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
         
     async def get_events(
         self, 
@@ -88,52 +111,58 @@ class OddsApiService:
             "bookmakers": ",".join(bookmakers)
         }
         
+        # Drop expired cache entries once per poll
+        self._evict_expired()
+        
         # Make API request with rate limiting
         await self._wait_for_rate_limit()
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                    self.requests_made += 1
-                    self.last_request_time = time.time()
+            session = await self._get_session()
+            async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=30)) as response:
+                self.requests_made += 1
+                self.last_request_time = time.time()
+                
+                if response.status == 200:
+                    raw_data = orjson.loads(await response.read())
+                    
+                    # Track API usage
+                    credits_used = request_config.calculate_credits()
+                    self.total_credits_used += credits_used
+                    
+                    print(f"✅ Successfully fetched {len(raw_data)} events")
+                    print(f"   Credits used: {credits_used} (Total: {self.total_credits_used:,})")
+                    
+                    # Process raw data into our models
+                    events = await self._process_raw_events(raw_data)
+                    
+                    # Update cache
+                    expires_at = time.monotonic() + self.cache_ttl
+                    for event in events:
+                        self.events_cache[event.event_id] = event
+                        self._cache_expiry[event.event_id] = expires_at
+                        heapq.heappush(self._expiry_heap, (expires_at, event.event_id))
+                    
+                    return events
+                    
+                elif response.status == 429:
+                    # Rate limit exceeded
+                    retry_after = response.headers.get('Retry-After', 60)
+                    raise HTTPException(
+                        status_code=429, 
+                        detail=f"Rate limit exceeded. Retry after {retry_after} seconds."
+                    )
+                elif response.status == 401:
+                    raise HTTPException(status_code=401, detail="Invalid API key")
+                elif response.status == 402:
+                    raise HTTPException(status_code=402, detail="Insufficient API credits")
+                else:
+                    error_text = await response.text()
+                    raise HTTPException(
+                        status_code=response.status,
+                        detail=f"Odds API error: {error_text}"
+                    )
                     
-                    if response.status == 200:
-                        raw_data = await response.json()
-                        
-                        # Track API usage
-                        credits_used = request_config.calculate_credits()
-                        self.total_credits_used += credits_used
-                        
-                        print(f"✅ Successfully fetched {len(raw_data)} events")
-                        print(f"   Credits used: {credits_used} (Total: {self.total_credits_used:,})")
-                        
-                        # Process raw data into our models
-                        events = await self._process_raw_events(raw_data)
-                        
-                        # Update cache
-                        for event in events:
-                            self.events_cache[event.event_id] = event
-                        
-                        return events
-                        
-                    elif response.status == 429:
-                        # Rate limit exceeded
-                        retry_after = response.headers.get('Retry-After', 60)
-                        raise HTTPException(
-                            status_code=429, 
-                            detail=f"Rate limit exceeded. Retry after {retry_after} seconds."
-                        )
-                    elif response.status == 401:
-                        raise HTTPException(status_code=401, detail="Invalid API key")
-                    elif response.status == 402:
-                        raise HTTPException(status_code=402, detail="Insufficient API credits")
-                    else:
-                        error_text = await response.text()
-                        raise HTTPException(
-                            status_code=response.status,
-                            detail=f"Odds API error: {error_text}"
-                        )
-                        
         except aiohttp.ClientError as e:
             raise HTTPException(status_code=500, detail=f"Network error: {str(e)}")
         except Exception as e:
@@ -145,22 +174,20 @@ class OddsApiService:
         
         for raw_event in raw_events:
             try:
-                # Parse raw event data
-                odds_event = OddsEvent(**raw_event)
-                
-                # Find our target bookmaker (Pinnacle)
+                # Find our target bookmaker (Pinnacle) directly in the raw payload -
+                # only the fields we keep are validated, via the Processed* models
                 target_bookmaker = None
-                for bookmaker in odds_event.bookmakers:
-                    if bookmaker.key == self.settings.target_bookmaker:
+                for bookmaker in raw_event["bookmakers"]:
+                    if bookmaker["key"] == self.settings.target_bookmaker:
                         target_bookmaker = bookmaker
                         break
                 
                 if not target_bookmaker:
-                    print(f"⚠️  No {self.settings.target_bookmaker} odds found for {odds_event.home_team} vs {odds_event.away_team}")
+                    print(f"⚠️  No {self.settings.target_bookmaker} odds found for {raw_event['home_team']} vs {raw_event['away_team']}")
                     continue
                 
                 # Process markets from target bookmaker
-                processed_event = await self._process_bookmaker_markets(odds_event, target_bookmaker)
+                processed_event = await self._process_bookmaker_markets(raw_event, target_bookmaker)
                 
                 if processed_event:
                     processed_events.append(processed_event)
@@ -172,27 +199,27 @@ class OddsApiService:
         print(f"📊 Processed {len(processed_events)} events with {self.settings.target_bookmaker} odds")
         return processed_events
     
-    async def _process_bookmaker_markets(self, odds_event: OddsEvent, bookmaker: Bookmaker) -> Optional[ProcessedEvent]:
+    async def _process_bookmaker_markets(self, raw_event: Dict[str, Any], bookmaker: Dict[str, Any]) -> Optional[ProcessedEvent]:
         """Process markets from a specific bookmaker into ProcessedEvent"""
         try:
             # Initialize processed event
             processed_event = ProcessedEvent(
-                event_id=odds_event.id,
-                sport=odds_event.sport_title,
-                commence_time=odds_event.commence_time,
-                home_team=odds_event.home_team,
-                away_team=odds_event.away_team,
+                event_id=raw_event["id"],
+                sport=raw_event["sport_title"],
+                commence_time=raw_event["commence_time"],
+                home_team=raw_event["home_team"],
+                away_team=raw_event["away_team"],
                 last_update=datetime.now(timezone.utc),
-                source_bookmaker=bookmaker.key
+                source_bookmaker=bookmaker["key"]
             )
             
             # Process each market type
-            for market in bookmaker.markets:
-                if market.key == MarketType.H2H.value:
+            for market in bookmaker["markets"]:
+                if market["key"] == MarketType.H2H.value:
                     processed_event.moneyline = await self._process_market(market, MarketType.H2H)
-                elif market.key == MarketType.SPREADS.value:
+                elif market["key"] == MarketType.SPREADS.value:
                     processed_event.spreads = await self._process_market(market, MarketType.SPREADS)
-                elif market.key == MarketType.TOTALS.value:
+                elif market["key"] == MarketType.TOTALS.value:
                     processed_event.totals = await self._process_market(market, MarketType.TOTALS)
             
             # Only return if we have at least one market
@@ -202,48 +229,60 @@ class OddsApiService:
             return None
             
         except Exception as e:
-            print(f"❌ Error processing markets for {odds_event.home_team} vs {odds_event.away_team}: {e}")
+            print(f"❌ Error processing markets for {raw_event.get('home_team')} vs {raw_event.get('away_team')}: {e}")
             return None
     
-    async def _process_market(self, market: BookmakerMarket, market_type: MarketType) -> ProcessedMarket:
+    async def _process_market(self, market: Dict[str, Any], market_type: MarketType) -> ProcessedMarket:
         """Process a single market into ProcessedMarket"""
-        processed_outcomes = []
+        outcomes = []
+        prices = []
         
-        for outcome in market.outcomes:
+        for outcome in market["outcomes"]:
+            try:
+                american_odds = int(outcome["price"])
+                if american_odds == 0:
+                    raise ValueError("American odds cannot be 0")
+                outcomes.append(outcome)
+                prices.append(american_odds)
+                
+            except Exception as e:
+                print(f"⚠️  Error processing outcome {outcome.get('name')}: {e}")
+                continue
+        
+        # Convert the whole market's prices in one vectorized pass
+        decimal_odds, probabilities = self._convert_american_odds(np.array(prices, dtype=np.int32))
+        
+        processed_outcomes = []
+        for outcome, american_odds, decimal, probability in zip(outcomes, prices, decimal_odds.tolist(), probabilities.tolist()):
             try:
                 # Convert to ProcessedOutcome
                 processed_outcome = ProcessedOutcome(
-                    name=outcome.name,
-                    american_odds=int(outcome.price),
-                    decimal_odds=self._american_to_decimal(int(outcome.price)),
-                    implied_probability=self._american_to_probability(int(outcome.price)),
-                    point=outcome.point
+                    name=outcome["name"],
+                    american_odds=american_odds,
+                    decimal_odds=decimal,
+                    implied_probability=probability,
+                    point=outcome.get("point")
                 )
                 processed_outcomes.append(processed_outcome)
                 
             except Exception as e:
-                print(f"⚠️  Error processing outcome {outcome.name}: {e}")
+                print(f"⚠️  Error processing outcome {outcome.get('name')}: {e}")
                 continue
         
         return ProcessedMarket(
             market_type=market_type,
             outcomes=processed_outcomes,
-            last_update=market.last_update
+            last_update=market["last_update"]
         )
     
-    def _american_to_decimal(self, american_odds: int) -> float:
-        """Convert American odds to decimal odds"""
-        if american_odds > 0:
-            return (american_odds / 100) + 1
-        else:
-            return (100 / abs(american_odds)) + 1
-    
-    def _american_to_probability(self, american_odds: int) -> float:
-        """Convert American odds to implied probability"""
-        if american_odds > 0:
-            return 100 / (american_odds + 100)
-        else:
-            return abs(american_odds) / (abs(american_odds) + 100)
+    def _convert_american_odds(self, american_odds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert non-zero American odds to (decimal odds, implied probabilities)"""
+        magnitude = np.abs(american_odds)
+        positive = american_odds > 0
+        
+        decimal_odds = np.where(positive, magnitude / 100, 100 / magnitude) + 1
+        probabilities = np.where(positive, 100, magnitude) / (magnitude + 100)
+        return decimal_odds, probabilities
     
     async def _wait_for_rate_limit(self):
         """Wait if necessary to respect rate limits"""
@@ -253,17 +292,22 @@ class OddsApiService:
                 wait_time = self.min_request_interval - time_since_last
                 await asyncio.sleep(wait_time)
     
+    def _evict_expired(self):
+        """Remove cache entries whose TTL has passed"""
+        now = time.monotonic()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, event_id = heapq.heappop(self._expiry_heap)
+            # Skip heap entries superseded by a later refresh of the same event
+            if self._cache_expiry.get(event_id) == expires_at:
+                del self._cache_expiry[event_id]
+                self.events_cache.pop(event_id, None)
+    
     def get_cached_event(self, event_id: str) -> Optional[ProcessedEvent]:
-        """Get event from cache if available and fresh"""
-        if event_id in self.events_cache:
-            event = self.events_cache[event_id]
-            age = (datetime.now(timezone.utc) - event.last_update).total_seconds()
-            if age < self.cache_ttl:
-                return event
-            else:
-                # Remove stale cache entry
-                del self.events_cache[event_id]
-        return None
+        """Get event from cache if available and its TTL hasn't passed"""
+        expires_at = self._cache_expiry.get(event_id)
+        if expires_at is None or expires_at <= time.monotonic():
+            return None
+        return self.events_cache.get(event_id)
     
     def get_usage_stats(self) -> Dict[str, Any]:
         """Get API usage statistics"""
@@ -292,23 +336,23 @@ class OddsApiService:
             url = self.settings.get_odds_api_url("sports")
             params = {"apiKey": self.api_key}
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 200:
-                        sports = await response.json()
-                        return {
-                            "success": True,
-                            "message": "Successfully connected to The Odds API",
-                            "available_sports": len(sports),
-                            "baseball_available": any(sport.get("group") == "Baseball" for sport in sports)
-                        }
-                    else:
-                        error_text = await response.text()
-                        return {
-                            "success": False,
-                            "message": f"API connection failed: HTTP {response.status}",
-                            "error": error_text
-                        }
+            session = await self._get_session()
+            async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status == 200:
+                    sports = orjson.loads(await response.read())
+                    return {
+                        "success": True,
+                        "message": "Successfully connected to The Odds API",
+                        "available_sports": len(sports),
+                        "baseball_available": any(sport.get("group") == "Baseball" for sport in sports)
+                    }
+                else:
+                    error_text = await response.text()
+                    return {
+                        "success": False,
+                        "message": f"API connection failed: HTTP {response.status}",
+                        "error": error_text
+                    }
         except Exception as e:
             return {
                 "success": False,
@@ -319,6 +363,8 @@ class OddsApiService:
     def clear_cache(self):
         """Clear the events cache"""
         self.events_cache.clear()
+        self._cache_expiry.clear()
+        self._expiry_heap.clear()
         print("🗑️  Events cache cleared")
 
 # Global odds API service instance
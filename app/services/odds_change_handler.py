@@ -4,10 +4,22 @@ Odds Change Detection and Handling
 Monitors Pinnacle odds changes and updates ProphetX bets accordingly
 """
 
+import logging
+import asyncio
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timezone
 from dataclasses import dataclass
 
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# (market_type, outcome_name, point) - point is None for moneyline outcomes
+OutcomeKey = Tuple[str, str, Optional[float]]
+
+# Odds change market names -> Odds API market keys stored on bets
+BET_MARKET_TYPES = {'moneyline': 'h2h', 'spreads': 'spreads', 'totals': 'totals'}
+
 @dataclass
 class OddsChange:
     """Represents a significant odds change"""
@@ -18,13 +30,41 @@ class OddsChange:
     new_odds: int
     change_amount: int
     timestamp: datetime
+    point: Optional[float] = None  # Spread/total line, None for moneyline
+    
+    @property
+    def label(self) -> str:
+        """Display name for logging (e.g. "Over_8.5" for totals)"""
+        return self.outcome_name if self.point is None else f"{self.outcome_name}_{self.point}"
+
+@dataclass(frozen=True)
+class OddsSnapshot:
+    """Compact odds snapshot for one event: outcome keys with parallel odds"""
+    keys: Tuple[OutcomeKey, ...]
+    odds: np.ndarray                    # int32 American odds, aligned with keys
+    positions: Dict[OutcomeKey, int]    # key -> index into keys/odds
+    
+    @classmethod
+    def empty(cls) -> "OddsSnapshot":
+        return cls(keys=(), odds=np.empty(0, dtype=np.int32), positions={})
+
+def detect_changes(old_odds: np.ndarray, new_odds: np.ndarray, threshold: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Indices and deltas of aligned odds that moved by at least threshold
+    
+    old_odds and new_odds must be parallel int32 arrays for the same outcomes.
+    """
+    deltas = new_odds - old_odds
+    idx = np.flatnonzero(np.abs(deltas) >= threshold)
+    return idx, deltas[idx]
 
 class OddsChangeHandler:
     """Handles odds changes and bet updates"""
     
-    def __init__(self, significant_change_threshold: int = 5):
+    def __init__(self, significant_change_threshold: int = 5, cancel_concurrency: int = 8):
         self.change_threshold = significant_change_threshold  # 5 point minimum change
-        self.odds_history: Dict[str, Dict] = {}  # event_id -> market data
+        self.cancel_concurrency = cancel_concurrency  # max in-flight cancel requests
+        self.odds_history: Dict[str, OddsSnapshot] = {}  # event_id -> odds snapshot
         
     async def process_odds_update(self, events_with_new_odds):
         """Process new odds and detect significant changes"""
@@ -36,7 +76,7 @@ class OddsChangeHandler:
             event_id = event.event_id
             
             # Get previous odds for comparison
-            previous_odds = self.odds_history.get(event_id, {})
+            previous_odds = self.odds_history.get(event_id, OddsSnapshot.empty())
             current_odds = self._extract_odds_snapshot(event)
             
             # Compare and detect changes
@@ -47,7 +87,7 @@ class OddsChangeHandler:
                 
                 # Log changes
                 for change in changes:
-                    print(f"📊 ODDS CHANGE: {change.outcome_name} {change.old_odds:+d} → {change.new_odds:+d} ({change.change_amount:+d})")
+                    logger.info("📊 ODDS CHANGE: %s %+d → %+d (%+d)", change.label, change.old_odds, change.new_odds, change.change_amount)
                 
                 # Update bets for this event if we're managing it
                 if event_id in market_maker_service.managed_events:
@@ -58,60 +98,57 @@ class OddsChangeHandler:
         
         return significant_changes
     
-    def _extract_odds_snapshot(self, event) -> Dict:
+    def _extract_odds_snapshot(self, event) -> OddsSnapshot:
         """Extract current odds for comparison"""
-        snapshot = {}
+        odds_by_key: Dict[OutcomeKey, int] = {}
         
         if event.moneyline:
-            snapshot['moneyline'] = {
-                outcome.name: outcome.american_odds 
-                for outcome in event.moneyline.outcomes
-            }
+            for outcome in event.moneyline.outcomes:
+                odds_by_key[('moneyline', outcome.name, None)] = outcome.american_odds
         
         if event.spreads:
-            snapshot['spreads'] = {
-                f"{outcome.name}_{outcome.point}": outcome.american_odds 
-                for outcome in event.spreads.outcomes
-            }
+            for outcome in event.spreads.outcomes:
+                odds_by_key[('spreads', outcome.name, outcome.point)] = outcome.american_odds
         
         if event.totals:
-            snapshot['totals'] = {
-                f"{outcome.name}_{outcome.point}": outcome.american_odds 
-                for outcome in event.totals.outcomes
-            }
-        
-        return snapshot
+            for outcome in event.totals.outcomes:
+                odds_by_key[('totals', outcome.name, outcome.point)] = outcome.american_odds
+        
+        keys = tuple(odds_by_key)
+        return OddsSnapshot(
+            keys=keys,
+            odds=np.fromiter(odds_by_key.values(), dtype=np.int32, count=len(keys)),
+            positions={key: i for i, key in enumerate(keys)}
+        )
     
-    def _detect_odds_changes(self, event_id: str, old_odds: Dict, new_odds: Dict) -> List[OddsChange]:
+    def _detect_odds_changes(self, event_id: str, old_odds: OddsSnapshot, new_odds: OddsSnapshot) -> List[OddsChange]:
         """Detect significant odds changes"""
-        changes = []
+        # Align outcomes present in both snapshots - new markets/outcomes are not changes
+        old_positions = old_odds.positions
+        new_indices = [i for i, key in enumerate(new_odds.keys) if key in old_positions]
+        if not new_indices:
+            return []
+        old_indices = [old_positions[new_odds.keys[i]] for i in new_indices]
+        aligned_old = old_odds.odds[old_indices]
+        aligned_new = new_odds.odds[new_indices]
+        
+        # Compare all aligned odds in one vectorized pass
+        significant, deltas = detect_changes(aligned_old, aligned_new, self.change_threshold)
         
-        for market_type in new_odds:
-            if market_type not in old_odds:
-                continue  # New market, not a change
-                
-            old_market = old_odds[market_type]
-            new_market = new_odds[market_type]
-            
-            for outcome_key in new_market:
-                if outcome_key not in old_market:
-                    continue  # New outcome, not a change
-                
-                old_value = old_market[outcome_key]
-                new_value = new_market[outcome_key]
-                change_amount = new_value - old_value
-                
-                if abs(change_amount) >= self.change_threshold:
-                    change = OddsChange(
-                        event_id=event_id,
-                        market_type=market_type,
-                        outcome_name=outcome_key,
-                        old_odds=old_value,
-                        new_odds=new_value,
-                        change_amount=change_amount,
-                        timestamp=datetime.now(timezone.utc)
-                    )
-                    changes.append(change)
+        changes = []
+        timestamp = datetime.now(timezone.utc)
+        for j, delta in zip(significant.tolist(), deltas.tolist()):
+            market_type, outcome_name, point = new_odds.keys[new_indices[j]]
+            changes.append(OddsChange(
+                event_id=event_id,
+                market_type=market_type,
+                outcome_name=outcome_name,
+                old_odds=int(aligned_old[j]),
+                new_odds=int(aligned_new[j]),
+                change_amount=delta,
+                timestamp=timestamp,
+                point=point
+            ))
         
         return changes
     
@@ -120,7 +157,7 @@ class OddsChangeHandler:
         from app.services.market_maker_service import market_maker_service
         from app.services.prophetx_service import prophetx_service
         
-        print(f"🔄 Updating bets for event {event_id} due to odds changes...")
+        logger.info("🔄 Updating bets for event %s due to odds changes...", event_id)
         
         # Group changes by market type
         changes_by_market = {}
@@ -139,63 +176,59 @@ class OddsChangeHandler:
         from app.services.market_maker_service import market_maker_service
         from app.services.prophetx_service import prophetx_service
         
-        print(f"   🔄 Refreshing {market_type} market bets...")
+        logger.info("   🔄 Refreshing %s market bets...", market_type)
         
-        # Find all active bets for this event and market
+        # Find all active bets for this event and market (bets placed without a
+        # market type can't be attributed, so they are refreshed with every market)
+        bets_by_event_market = market_maker_service.bets_by_event_market
+        bet_keys = (bets_by_event_market.get((event_id, BET_MARKET_TYPES.get(market_type, market_type)), set()) |
+                    bets_by_event_market.get((event_id, None), set()))
         bets_to_cancel = []
-        for bet in market_maker_service.all_bets.values():
-            if (bet.is_active and 
-                event_id in bet.external_id and  # Simple check - could be more sophisticated
-                self._bet_belongs_to_market(bet, market_type)):
+        for external_id in bet_keys:
+            bet = market_maker_service.all_bets[external_id]
+            if bet.is_active:
                 bets_to_cancel.append(bet)
         
         if not bets_to_cancel:
-            print(f"   ℹ️  No active bets to cancel for {market_type} market")
+            logger.info("   ℹ️  No active bets to cancel for %s market", market_type)
             return
         
-        print(f"   ❌ Cancelling {len(bets_to_cancel)} bets due to odds changes...")
+        logger.info("   ❌ Cancelling %d bets due to odds changes...", len(bets_to_cancel))
         
-        # Cancel bets individually (or use bulk cancel if available)
-        cancelled_count = 0
-        for bet in bets_to_cancel:
-            try:
+        # Cancel bets concurrently, bounded to stay within ProphetX rate limits
+        semaphore = asyncio.Semaphore(self.cancel_concurrency)
+        
+        async def cancel(bet):
+            async with semaphore:
                 # Use ProphetX bet ID if available, otherwise use external ID
-                bet_id_to_cancel = bet.bet_id or bet.external_id
-                
-                cancel_result = await prophetx_service.cancel_wager(bet_id_to_cancel)
+                return await prophetx_service.cancel_wager(bet.bet_id or bet.external_id)
+        
+        results = await asyncio.gather(*(cancel(bet) for bet in bets_to_cancel), return_exceptions=True)
+        
+        from app.services.market_making_strategy import market_making_strategy
+        
+        cancelled_count = 0
+        for bet, cancel_result in zip(bets_to_cancel, results):
+            if isinstance(cancel_result, Exception):
+                logger.warning("      ⚠️ Exception cancelling bet %s: %s", bet.external_id, cancel_result)
+            elif cancel_result.get("success", False):
+                bet.status = "cancelled"
+                bet.unmatched_stake = 0.0
+                cancelled_count += 1
+                logger.info("      ❌ Cancelled: %s %+d", bet.selection_name, bet.odds)
                 
-                if cancel_result.get("success", False):
-                    bet.status = "cancelled"
-                    bet.unmatched_stake = 0.0
-                    cancelled_count += 1
-                    print(f"      ❌ Cancelled: {bet.selection_name} {bet.odds:+d}")
-                    
-                    # Clear wait period for this line so new bets can be placed immediately
-                    from app.services.market_making_strategy import market_making_strategy
-                    market_making_strategy.betting_manager.clear_wait_period(bet.line_id)
-                    
-                else:
-                    print(f"      ⚠️ Failed to cancel bet {bet.external_id}: {cancel_result.get('error', 'Unknown error')}")
-                    
-            except Exception as e:
-                print(f"      ⚠️ Exception cancelling bet {bet.external_id}: {e}")
-        
-        print(f"   ✅ Successfully cancelled {cancelled_count}/{len(bets_to_cancel)} bets")
-        print(f"   🔄 New bets will be created in next market making cycle")
-    
-    def _bet_belongs_to_market(self, bet, market_type: str) -> bool:
-        """Check if a bet belongs to a specific market type"""
-        # This is a simplified check - you might want to store market_type with bets
-        # or use a more sophisticated matching method
-        
-        # For now, we'll assume all bets need to be cancelled when any market changes
-        # This is conservative but safe
-        return True
+                # Clear wait period for this line so new bets can be placed immediately
+                market_making_strategy.betting_manager.clear_wait_period(bet.line_id)
+            else:
+                logger.warning("      ⚠️ Failed to cancel bet %s: %s", bet.external_id, cancel_result.get('error', 'Unknown error'))
+        
+        logger.info("   ✅ Successfully cancelled %d/%d bets", cancelled_count, len(bets_to_cancel))
+        logger.info("   🔄 New bets will be created in next market making cycle")
     
     def clear_odds_history(self):
         """Clear odds history (useful for testing or resets)"""
         self.odds_history.clear()
-        print("🗑️ Odds history cleared")
+        logger.info("🗑️ Odds history cleared")
 
 # Global odds change handler instance
 odds_change_handler = OddsChangeHandler()
\ No newline at end of file
@@ -4,15 +4,58 @@ ProphetX Events Service - FIXED VERSION
 Handles fetching upcoming events from ProphetX API with proper team name extraction
 """
 
-import requests
+import asyncio
+import logging
+import sys
+import time
+import orjson
 from datetime import datetime, timezone, timedelta
-from typing import List, Optional, Dict, Any
-from dataclasses import dataclass
+from typing import List, Optional, Dict, Any, Tuple, NamedTuple
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache
 from fastapi import HTTPException
 
 from app.services.prophetx_service import prophetx_service
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+def _intern(value: Any) -> Any:
+    """Intern strings that repeat across many events (sport, tournament, team names)"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+# Punctuation dropped from team names before comparison
+_TEAM_NAME_PUNCTUATION = str.maketrans('', '', '.,')
+
+@lru_cache(maxsize=4096)
+def normalize_team_name(name: str) -> str:
+    """Normalize team name for comparison (memoized - team names repeat constantly)"""
+    if not name:
+        return ""
+    
+    # Lowercase, strip punctuation in one translate pass, and collapse double spaces
+    return name.lower().strip().translate(_TEAM_NAME_PUNCTUATION).replace("  ", " ")
+
+class TeamNameKey(NamedTuple):
+    """Precomputed comparison data for one team name"""
+    normalized: str
+    words: frozenset
+    signature: int  # 64-bit bloom signature of words - disjoint signatures mean no shared words
+    
+    @classmethod
+    def from_name(cls, name: str) -> "TeamNameKey":
+        return cls.from_normalized(normalize_team_name(name))
+    
+    @classmethod
+    def from_normalized(cls, normalized: str) -> "TeamNameKey":
+        words = frozenset(normalized.split())
+        signature = 0
+        for word in words:
+            signature |= 1 << (hash(word) & 63)
+        return cls(normalized, words, signature)
+
+@dataclass(slots=True)
 class ProphetXEvent:
     """ProphetX event structure"""
     event_id: int
@@ -22,7 +65,24 @@ class ProphetXEvent:
     away_team: str
     commence_time: datetime
     status: str
-    raw_data: Dict[str, Any]
+    raw_bytes: bytes = field(default=b"", repr=False)  # Event's JSON as returned by ProphetX
+    
+    # Start time as unix seconds, for cheap window filtering
+    commence_ts: float = field(init=False, repr=False, compare=False)
+    
+    # Normalized team names, word sets and signatures, computed once for matching
+    _home_key: TeamNameKey = field(init=False, repr=False, compare=False)
+    _away_key: TeamNameKey = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.commence_ts = self.commence_time.timestamp()
+        self._home_key = TeamNameKey.from_name(self.home_team)
+        self._away_key = TeamNameKey.from_name(self.away_team)
+    
+    @property
+    def raw_data(self) -> Dict[str, Any]:
+        """Raw ProphetX event data, parsed on access"""
+        return orjson.loads(self.raw_bytes) if self.raw_bytes else {}
     
     @property
     def display_name(self) -> str:
@@ -32,11 +92,9 @@ class ProphetXEvent:
     @property
     def starts_in_hours(self) -> float:
         """Get hours until event starts"""
-        now = datetime.now(self.commence_time.tzinfo if self.commence_time.tzinfo else timezone.utc)
-        delta = self.commence_time - now
-        return delta.total_seconds() / 3600
+        return (self.commence_ts - time.time()) / 3600
 
-@dataclass
+@dataclass(slots=True)
 class ProphetXTournament:
     """ProphetX tournament structure"""
     tournament_id: int
@@ -53,7 +111,17 @@ class ProphetXEventsService:
         self.tournaments_cache: List[ProphetXTournament] = []
         self.events_cache: Dict[int, List[ProphetXEvent]] = {}
         self.cache_ttl = 300  # 5 minutes
-        self.last_cache_update = 0
+        self.last_cache_update = 0  # time.monotonic() of the last upcoming-events refresh
+        
+        # TTL caches: key -> (time.monotonic() when fetched, result)
+        self._tournaments_by_filter: Dict[str, Tuple[float, List[ProphetXTournament]]] = {}
+        self._upcoming_events_by_window: Dict[int, Tuple[float, List[ProphetXEvent]]] = {}
+        
+        # Upcoming events per look-ahead window as (sorted start timestamps, events in that order)
+        self._events_sorted_by_ts: Dict[int, Tuple[array, List[ProphetXEvent]]] = {}
+        
+        # Max tournament fetches in flight at once
+        self.max_concurrent_fetches = 10
         
     async def get_tournaments(self, sport_filter: str = "baseball") -> List[ProphetXTournament]:
         """
@@ -65,16 +133,20 @@ class ProphetXEventsService:
         Returns:
             List of ProphetX tournaments
         """
-        print(f"🏆 Fetching ProphetX tournaments (filter: {sport_filter})...")
+        cached = self._tournaments_by_filter.get(sport_filter)
+        if cached and time.monotonic() - cached[0] < self.cache_ttl:
+            return list(cached[1])
+        
+        logger.info("🏆 Fetching ProphetX tournaments (filter: %s)...", sport_filter)
         
         try:
             headers = await prophetx_service.get_auth_headers()
             url = f"{prophetx_service.base_url}/partner/mm/get_tournaments"
             
-            response = requests.get(url, headers=headers)
+            response = await prophetx_service.conditional_get(url, headers=headers)
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 tournaments_data = data.get('data', {}).get('tournaments', [])
                 
                 tournaments = []
@@ -88,20 +160,21 @@ class ProphetXEventsService:
                     tournament = ProphetXTournament(
                         tournament_id=tournament_data.get('id'),
                         name=tournament_data.get('name', 'Unknown Tournament'),
-                        sport_name=tournament_data.get('sport', {}).get('name', 'Unknown'),
+                        sport_name=_intern(tournament_data.get('sport', {}).get('name', 'Unknown')),
                         category_name=tournament_data.get('category', {}).get('name'),
                         raw_data=tournament_data
                     )
                     tournaments.append(tournament)
                 
-                print(f"✅ Found {len(tournaments)} {sport_filter} tournaments on ProphetX")
+                logger.info("✅ Found %d %s tournaments on ProphetX", len(tournaments), sport_filter)
                 
-                # Log tournament details for debugging
-                for tournament in tournaments[:5]:  # Show first 5
-                    print(f"   📋 {tournament.name} (ID: {tournament.tournament_id})")
+                # Log tournament details for debugging (first 5, one line)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("   📋 %s", ", ".join(f"{t.name} (ID: {t.tournament_id})" for t in tournaments[:5]))
                 
                 self.tournaments_cache = tournaments
-                return tournaments
+                self._tournaments_by_filter[sport_filter] = (time.monotonic(), tournaments)
+                return list(tournaments)
                 
             else:
                 raise HTTPException(
@@ -133,7 +206,7 @@ class ProphetXEventsService:
                 elif side == 'away':
                     away_team = team_name
             
-            print(f"   📝 Extracted teams: {away_team} @ {home_team}")
+            logger.debug("   📝 Extracted teams: %s @ %s", away_team, home_team)
             return home_team, away_team
         
         # Fallback: try direct fields
@@ -158,17 +231,17 @@ class ProphetXEventsService:
         Returns:
             List of ProphetX events
         """
-        print(f"📅 Fetching events for ProphetX tournament {tournament_id}...")
+        logger.info("📅 Fetching events for ProphetX tournament %s...", tournament_id)
         
         try:
             headers = await prophetx_service.get_auth_headers()
             url = f"{prophetx_service.base_url}/partner/mm/get_sport_events"
             params = {"tournament_id": tournament_id}
             
-            response = requests.get(url, headers=headers, params=params)
+            response = await prophetx_service.request("GET", url, headers=headers, params=params)
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 events_data = data.get('data', {}).get('sport_events', [])
                 
                 events = []
@@ -196,26 +269,26 @@ class ProphetXEventsService:
                         
                         event = ProphetXEvent(
                             event_id=event_data.get('event_id', event_data.get('id')),
-                            sport_name=event_data.get('sport_name', 'Baseball'),
-                            tournament_name=event_data.get('tournament_name', 'Unknown Tournament'),
-                            home_team=home_team,
-                            away_team=away_team,
+                            sport_name=_intern(event_data.get('sport_name', 'Baseball')),
+                            tournament_name=_intern(event_data.get('tournament_name', 'Unknown Tournament')),
+                            home_team=_intern(home_team),
+                            away_team=_intern(away_team),
                             commence_time=commence_time,
-                            status=event_data.get('status', 'not_started'),
-                            raw_data=event_data
+                            status=_intern(event_data.get('status', 'not_started')),
+                            raw_bytes=orjson.dumps(event_data)
                         )
                         events.append(event)
                         
                     except Exception as e:
-                        print(f"⚠️  Error parsing event: {e}")
-                        print(f"   Raw data: {event_data}")
+                        logger.warning("⚠️  Error parsing event: %s", e)
+                        logger.debug("   Raw data: %s", event_data)
                         continue
                 
-                print(f"✅ Found {len(events)} upcoming events in tournament {tournament_id}")
+                logger.info("✅ Found %d upcoming events in tournament %s", len(events), tournament_id)
                 
-                # Show sample events for debugging
-                for event in events[:3]:
-                    print(f"   ⚾ {event.display_name} (starts in {event.starts_in_hours:.1f}h)")
+                # Show sample events for debugging (first 3, one line)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("   ⚾ %s", ", ".join(f"{e.display_name} (starts in {e.starts_in_hours:.1f}h)" for e in events[:3]))
                 
                 # Cache the results
                 self.events_cache[tournament_id] = events
@@ -223,11 +296,11 @@ class ProphetXEventsService:
                 return events
                 
             else:
-                print(f"❌ Error fetching events for tournament {tournament_id}: {response.status_code}")
+                logger.error("❌ Error fetching events for tournament %s: %s", tournament_id, response.status_code)
                 return []
                 
         except Exception as e:
-            print(f"❌ Error fetching events for tournament {tournament_id}: {e}")
+            logger.error("❌ Error fetching events for tournament %s: %s", tournament_id, e)
             return []
     
     async def get_all_upcoming_events(self, hours_ahead: int = 72) -> List[ProphetXEvent]:
@@ -240,33 +313,62 @@ class ProphetXEventsService:
         Returns:
             List of all upcoming ProphetX baseball events
         """
-        print(f"🔍 Fetching all upcoming ProphetX baseball events (next {hours_ahead} hours)...")
+        cached = self._upcoming_events_by_window.get(hours_ahead)
+        if cached and time.monotonic() - cached[0] < self.cache_ttl:
+            return list(cached[1])
+        
+        logger.info("🔍 Fetching all upcoming ProphetX baseball events (next %s hours)...", hours_ahead)
         
         # Get all baseball tournaments
         tournaments = await self.get_tournaments(sport_filter="baseball")
         
-        all_events = []
-        cutoff_time = datetime.now(timezone.utc) + timedelta(hours=hours_ahead)
+        # Fetch all tournaments concurrently, bounded to respect rate limits
+        semaphore = asyncio.Semaphore(self.max_concurrent_fetches)
         
-        for tournament in tournaments:
+        async def fetch_tournament_events(index: int, tournament: ProphetXTournament):
             try:
-                events = await self.get_events_for_tournament(tournament.tournament_id)
-                
-                # Filter by time window
-                for event in events:
-                    if event.commence_time <= cutoff_time:
-                        all_events.append(event)
-                        
+                async with semaphore:
+                    return index, await self.get_events_for_tournament(tournament.tournament_id)
             except Exception as e:
-                print(f"⚠️  Error fetching events for {tournament.name}: {e}")
+                return index, e
+        
+        cutoff_ts = time.time() + hours_ahead * 3600
+        
+        # Filter each tournament as soon as it arrives, while the rest are still in flight.
+        # Results are slotted by tournament so the final order doesn't depend on arrival order.
+        in_window: List[List[ProphetXEvent]] = [[] for _ in tournaments]
+        
+        for next_result in asyncio.as_completed(
+            [fetch_tournament_events(index, tournament) for index, tournament in enumerate(tournaments)]
+        ):
+            index, events = await next_result
+            if isinstance(events, Exception):
+                logger.warning("⚠️  Error fetching events for %s: %s", tournaments[index].name, events)
                 continue
+            
+            # Filter by time window
+            in_window[index] = [event for event in events if event.commence_ts <= cutoff_ts]
         
         # Sort by start time
-        all_events.sort(key=lambda x: x.commence_time)
+        all_events = [event for events in in_window for event in events]
+        all_events.sort(key=lambda x: x.commence_ts)
+        
+        logger.info("✅ Total upcoming ProphetX baseball events: %d", len(all_events))
         
-        print(f"✅ Total upcoming ProphetX baseball events: {len(all_events)}")
+        self.last_cache_update = time.monotonic()
+        self._upcoming_events_by_window[hours_ahead] = (self.last_cache_update, all_events)
         
-        return all_events
+        # Keep the start timestamps alongside so lookups can bisect straight to the time window
+        self._events_sorted_by_ts[hours_ahead] = (array('d', [event.commence_ts for event in all_events]), all_events)
+        return list(all_events)
+    
+    def clear_cache(self):
+        """Drop cached tournaments and events so the next lookup refetches"""
+        self.tournaments_cache = []
+        self.events_cache.clear()
+        self._tournaments_by_filter.clear()
+        self._upcoming_events_by_window.clear()
+        self._events_sorted_by_ts.clear()
     
     async def get_event_markets(self, event_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -283,16 +385,16 @@ class ProphetXEventsService:
             url = f"{prophetx_service.base_url}/partner/v2/mm/get_markets"
             params = {"event_id": event_id}
             
-            response = requests.get(url, headers=headers, params=params)
+            response = await prophetx_service.request("GET", url, headers=headers, params=params)
             
             if response.status_code == 200:
-                return response.json()
+                return orjson.loads(response.content)
             else:
-                print(f"❌ Error fetching markets for event {event_id}: {response.status_code}")
+                logger.error("❌ Error fetching markets for event %s: %s", event_id, response.status_code)
                 return None
                 
         except Exception as e:
-            print(f"❌ Error fetching markets for event {event_id}: {e}")
+            logger.error("❌ Error fetching markets for event %s: %s", event_id, e)
             return None
     
     async def find_event_by_teams_and_time(
@@ -314,54 +416,49 @@ class ProphetXEventsService:
         Returns:
             Matching ProphetX event or None
         """
-        all_events = await self.get_all_upcoming_events()
+        hours_ahead = 72
+        await self.get_all_upcoming_events(hours_ahead)
+        start_times, events = self._events_sorted_by_ts.get(hours_ahead, (array('d'), []))
         
         # Normalize team names for comparison
-        home_normalized = self._normalize_team_name(home_team)
-        away_normalized = self._normalize_team_name(away_team)
+        home_key = TeamNameKey.from_name(home_team)
+        away_key = TeamNameKey.from_name(away_team)
+        
+        # Only events starting inside the tolerance window can match
+        target_ts = commence_time.timestamp()
+        lo = bisect_left(start_times, target_ts - time_tolerance_hours * 3600)
+        hi = bisect_right(start_times, target_ts + time_tolerance_hours * 3600)
         
-        for event in all_events:
+        for event in events[lo:hi]:
             # Check time proximity
-            time_diff = abs((event.commence_time - commence_time).total_seconds() / 3600)
+            time_diff = abs(event.commence_ts - target_ts) / 3600
             if time_diff > time_tolerance_hours:
                 continue
             
-            # Check team name similarity
-            event_home_norm = self._normalize_team_name(event.home_team)
-            event_away_norm = self._normalize_team_name(event.away_team)
-            
-            # Check both orientations (home/away might be swapped)
-            match1 = (self._teams_match(home_normalized, event_home_norm) and 
-                     self._teams_match(away_normalized, event_away_norm))
-            match2 = (self._teams_match(home_normalized, event_away_norm) and 
-                     self._teams_match(away_normalized, event_home_norm))
+            # Check team name similarity against the event's precomputed names,
+            # in both orientations (home/away might be swapped)
+            match1 = (self._team_keys_match(home_key, event._home_key) and 
+                      self._team_keys_match(away_key, event._away_key))
+            match2 = (self._team_keys_match(home_key, event._away_key) and 
+                      self._team_keys_match(away_key, event._home_key))
             
             if match1 or match2:
-                print(f"✅ Found ProphetX match: {event.display_name} (ID: {event.event_id})")
+                logger.info("✅ Found ProphetX match: %s (ID: %s)", event.display_name, event.event_id)
                 return event
         
         return None
     
     def _normalize_team_name(self, name: str) -> str:
         """Normalize team name for comparison"""
-        if not name:
-            return ""
-        
-        # Convert to lowercase and remove common variations
-        normalized = name.lower().strip()
-        
-        # Remove common prefixes/suffixes
-        normalized = normalized.replace(".", "")
-        normalized = normalized.replace(",", "")
-        
-        # Handle common baseball name variations
-        # For team names, just clean them up
-        normalized = normalized.replace("  ", " ")  # Remove double spaces
-        
-        return normalized
+        return normalize_team_name(name)
     
     def _teams_match(self, name1: str, name2: str, threshold: float = 0.8) -> bool:
         """Check if two team names match with fuzzy matching"""
+        return self._team_keys_match(TeamNameKey.from_normalized(name1), TeamNameKey.from_normalized(name2), threshold)
+    
+    def _team_keys_match(self, key1: TeamNameKey, key2: TeamNameKey, threshold: float = 0.8) -> bool:
+        """_teams_match on precomputed team name keys"""
+        name1, name2 = key1.normalized, key2.normalized
         if not name1 or not name2:
             return False
         
@@ -373,13 +470,16 @@ class ProphetXEventsService:
         if name1 in name2 or name2 in name1:
             return True
         
-        # Simple word overlap check for baseball teams
-        words1 = set(name1.split())
-        words2 = set(name2.split())
+        # A shared word sets the same signature bit on both sides, so disjoint
+        # signatures rule out any overlap without touching the word sets
+        if not key1.signature & key2.signature:
+            return False
         
+        # Simple word overlap check for baseball teams
+        words1, words2 = key1.words, key2.words
         if words1 and words2:
-            overlap = len(words1.intersection(words2))
-            total_unique = len(words1.union(words2))
+            overlap = len(words1 & words2)
+            total_unique = len(words1 | words2)
             similarity = overlap / total_unique if total_unique > 0 else 0
             return similarity >= threshold
         
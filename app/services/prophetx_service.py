@@ -4,15 +4,137 @@ ProphetX Service - COMPLETE API COVERAGE
 Comprehensive ProphetX API methods for granular bet and line management
 """
 
-import requests
+import httpx
+import logging
+import orjson
+import random
 import time
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Dict, Any, List
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, List, Tuple
 from fastapi import HTTPException
 import asyncio
 
 from app.core.config import get_settings
 
+logger = logging.getLogger(__name__)
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delay in seconds or an HTTP date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+class AIMDConcurrencyLimiter:
+    """
+    Adaptive cap on in-flight ProphetX requests
+    
+    The limit grows additively on every successful response and is cut
+    multiplicatively on 429/5xx or network errors. A Retry-After from the
+    server pauses all new requests until that deadline has passed.
+    """
+    
+    def __init__(self, max_limit: int, min_limit: int = 1, increase_step: float = 0.5, decrease_factor: float = 0.5):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self.throttled_until = 0.0  # time.monotonic() deadline from Retry-After
+        self._condition = asyncio.Condition()
+    
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        # Checked after taking a slot so queued requests also honor a fresh Retry-After
+        try:
+            await self.wait_if_throttled()
+        except BaseException:
+            await self.__aexit__(None, None, None)
+            raise
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+    
+    async def wait_if_throttled(self):
+        """Sleep until any server-requested pause has passed"""
+        delay = self.throttled_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+    
+    def on_success(self):
+        """Additive increase after a healthy response"""
+        self.limit = min(float(self.max_limit), self.limit + self.increase_step)
+    
+    def on_error(self, retry_after: Optional[float] = None):
+        """Multiplicative decrease after a throttled/failed response"""
+        self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+        if retry_after:
+            self.throttled_until = max(self.throttled_until, time.monotonic() + retry_after)
+
+# Wager statuses that won't change again (cached longer by get_wager_by_id)
+FINAL_WAGER_STATUSES = frozenset({
+    'settled', 'manually_settled', 'closed', 'canceled', 'cancelled', 'void', 'wiped', 'invalid', 'expired', 'rejected'
+})
+
+# Default history window for get_all_my_wagers, also the window get_my_wagers_by_line indexes
+WAGER_HISTORY_DAYS_BACK = 7
+
+def _wagers_cache_key(include_matched: bool, days_back: int) -> Tuple[bool, int]:
+    """Key of a get_all_my_wagers result in ProphetXService._wagers_cache"""
+    return (include_matched, days_back)
+
+def _monotonic_deadline(expire_timestamp: Optional[float]) -> Optional[float]:
+    """Convert a unix expiry timestamp into a time.monotonic() deadline"""
+    if not expire_timestamp:
+        return None
+    return time.monotonic() + (expire_timestamp - time.time())
+
+class TokenBucketRateLimiter:
+    """
+    Cap on requests started per second
+    
+    Tokens refill continuously at `rate` per second up to `capacity`; each
+    request takes one, waiting for the refill when the bucket is empty.
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Take one token, sleeping until one is available"""
+        async with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            
+            if self.tokens < 1:
+                # Holding the lock while sleeping keeps waiters in FIFO order
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self.tokens = 1.0
+                self.updated_at = time.monotonic()
+            
+            self.tokens -= 1
+
 class ProphetXAuthManager:
     """
     Enhanced authentication manager with automatic token refresh
@@ -38,18 +160,31 @@ class ProphetXAuthManager:
         self.refresh_expire_time: Optional[int] = None
         self.is_authenticated = False
         
+        # access_expire_time as a time.monotonic() deadline - immune to wall-clock jumps
+        self._access_deadline: Optional[float] = None
+        
         # Auto-refresh settings
         self.refresh_buffer_seconds = 120  # Refresh 2 minutes before expiry
         self.refresh_task: Optional[asyncio.Task] = None
         self.refresh_running = False
+        self._stop_refresh = asyncio.Event()  # wakes the refresh loop's sleep on shutdown
         
         # Retry settings
         self.max_auth_retries = 3
         self.auth_retry_delay = 5  # seconds
         
+        # Request headers for the current access token (rebuilt only when the token changes)
+        self._auth_headers: Optional[Dict[str, str]] = None
+        
+        # Serializes refresh/re-auth so a burst of callers triggers one refresh, not one each
+        self._auth_lock = asyncio.Lock()
+        
+        # Refresh started by _ensure_fresh_token that concurrent callers await together
+        self._refresh_in_flight: Optional[asyncio.Task] = None
+        
     async def authenticate(self) -> Dict[str, Any]:
         """Enhanced authentication with better error handling"""
-        print("🔐 Authenticating with ProphetX...")
+        logger.info("🔐 Authenticating with ProphetX...")
         
         url = f"{self.base_url}/partner/auth/login"
         payload = {
@@ -61,15 +196,16 @@ class ProphetXAuthManager:
         
         for attempt in range(self.max_auth_retries):
             try:
-                response = requests.post(url, headers=headers, json=payload, timeout=30)
+                response = await self.prophetx_service.request("POST", url, headers=headers, content=orjson.dumps(payload), timeout=30)
                 
                 if response.status_code == 200:
-                    data = response.json()
+                    data = orjson.loads(response.content)
                     token_data = data.get('data', {})
                     
                     self.access_token = token_data.get('access_token')
                     self.refresh_token = token_data.get('refresh_token')
                     self.access_expire_time = token_data.get('access_expire_time')
+                    self._access_deadline = _monotonic_deadline(self.access_expire_time)
                     self.refresh_expire_time = token_data.get('refresh_expire_time')
                     
                     if self.access_token and self.refresh_token:
@@ -81,10 +217,11 @@ class ProphetXAuthManager:
                         access_expire_dt = datetime.fromtimestamp(self.access_expire_time, tz=timezone.utc)
                         refresh_expire_dt = datetime.fromtimestamp(self.refresh_expire_time, tz=timezone.utc)
                         
-                        print("✅ ProphetX authentication successful!")
-                        print(f"   Environment: {'SANDBOX' if self.sandbox else 'PRODUCTION'}")
-                        print(f"   Access token expires: {access_expire_dt}")
-                        print(f"   Refresh token expires: {refresh_expire_dt}")
+                        logger.info("✅ ProphetX authentication successful!")
+                        logger.debug(
+                            "   Environment: %s, access token expires: %s, refresh token expires: %s",
+                            'SANDBOX' if self.sandbox else 'PRODUCTION', access_expire_dt, refresh_expire_dt
+                        )
                         
                         # Start auto-refresh task
                         await self._start_refresh_task()
@@ -101,16 +238,16 @@ class ProphetXAuthManager:
                         
                 else:
                     error_msg = f"HTTP {response.status_code}: {response.text}"
-                    print(f"❌ Authentication attempt {attempt + 1} failed: {error_msg}")
+                    logger.error("❌ Authentication attempt %s failed: %s", attempt + 1, error_msg)
                     
                     if attempt < self.max_auth_retries - 1:
-                        print(f"   Retrying in {self.auth_retry_delay} seconds...")
+                        logger.debug("   Retrying in %s seconds...", self.auth_retry_delay)
                         await asyncio.sleep(self.auth_retry_delay)
                     else:
                         raise Exception(error_msg)
                         
-            except requests.exceptions.RequestException as e:
-                print(f"❌ Network error on attempt {attempt + 1}: {e}")
+            except httpx.HTTPError as e:
+                logger.error("❌ Network error on attempt %s: %s", attempt + 1, e)
                 if attempt < self.max_auth_retries - 1:
                     await asyncio.sleep(self.auth_retry_delay)
                 else:
@@ -120,11 +257,16 @@ class ProphetXAuthManager:
     
     async def refresh_access_token(self) -> Dict[str, Any]:
         """Refresh the access token using the refresh token"""
+        async with self._auth_lock:
+            return await self._refresh_access_token()
+    
+    async def _refresh_access_token(self) -> Dict[str, Any]:
+        """Refresh request itself - caller must hold _auth_lock"""
         if not self.refresh_token:
-            print("❌ No refresh token available - need to re-authenticate")
+            logger.error("❌ No refresh token available - need to re-authenticate")
             return await self.authenticate()
         
-        print("🔄 Refreshing ProphetX access token...")
+        logger.info("🔄 Refreshing ProphetX access token...")
         
         url = f"{self.base_url}/partner/auth/refresh"
         headers = {
@@ -133,25 +275,28 @@ class ProphetXAuthManager:
         }
         
         try:
-            response = requests.post(url, headers=headers, timeout=30)
+            response = await self.prophetx_service.request("POST", url, headers=headers, timeout=30)
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 token_data = data.get('data', {})
                 
                 # Update tokens
                 old_access_token = self.access_token
                 self.access_token = token_data.get('access_token')
                 self.access_expire_time = token_data.get('access_expire_time')
+                self._access_deadline = _monotonic_deadline(self.access_expire_time)
                 
                 # Update service auth state
                 self._update_service_auth_state()
                 
                 access_expire_dt = datetime.fromtimestamp(self.access_expire_time, tz=timezone.utc)
                 
-                print("✅ Access token refreshed successfully!")
-                print(f"   New expiry: {access_expire_dt}")
-                print(f"   Valid for: {(self.access_expire_time - time.time()) / 60:.1f} minutes")
+                logger.info("✅ Access token refreshed successfully!")
+                logger.debug(
+                    "   New expiry: %s (valid for %.1f minutes)",
+                    access_expire_dt, (self.access_expire_time - time.time()) / 60
+                )
                 
                 return {
                     "success": True,
@@ -161,17 +306,22 @@ class ProphetXAuthManager:
                 }
             else:
                 error_msg = f"HTTP {response.status_code}: {response.text}"
-                print(f"❌ Token refresh failed: {error_msg}")
-                print("🔄 Attempting full re-authentication...")
+                logger.error("❌ Token refresh failed: %s", error_msg)
+                logger.info("🔄 Attempting full re-authentication...")
                 return await self.authenticate()
                 
         except Exception as e:
-            print(f"❌ Error refreshing token: {e}")
-            print("🔄 Attempting full re-authentication...")
+            logger.error("❌ Error refreshing token: %s", e)
+            logger.info("🔄 Attempting full re-authentication...")
             return await self.authenticate()
     
     def _update_service_auth_state(self):
         """Update the main ProphetX service with current auth state"""
+        self._auth_headers = {
+            'Authorization': f'Bearer {self.access_token}',
+            'Content-Type': 'application/json'
+        } if self.access_token else None
+        
         self.prophetx_service.access_token = self.access_token
         self.prophetx_service.refresh_token = self.refresh_token
         self.prophetx_service.access_expire_time = self.access_expire_time
@@ -180,71 +330,119 @@ class ProphetXAuthManager:
     
     def is_token_expired(self, buffer_seconds: int = 0) -> bool:
         """Check if access token is expired or will expire within buffer_seconds"""
-        if not self.access_expire_time:
+        if self._access_deadline is None:
             return True
         
-        current_time = time.time()
-        return current_time >= (self.access_expire_time - buffer_seconds)
+        return time.monotonic() >= (self._access_deadline - buffer_seconds)
     
     def time_until_expiry(self) -> float:
         """Get seconds until token expires"""
-        if not self.access_expire_time:
+        if self._access_deadline is None:
             return 0
-        return max(0, self.access_expire_time - time.time())
+        return max(0, self._access_deadline - time.monotonic())
     
     async def get_valid_auth_headers(self) -> Dict[str, str]:
-        """Get auth headers, refreshing token if necessary"""
+        """
+        Get auth headers, refreshing token if necessary
         
-        # Check if we need to refresh
-        if self.is_token_expired(buffer_seconds=30):  # 30 second buffer for API calls
-            print("🔄 Token expired or expiring soon - refreshing...")
-            await self.refresh_access_token()
+        The background refresh task renews the token well before expiry, so this
+        is normally a read of the cached headers; the inline refresh only runs if
+        that task isn't keeping up.
+        """
+        # Fast path: valid token and no refresh in flight
+        if (self._auth_headers is not None and not self._auth_lock.locked()
+                and not self.is_token_expired(buffer_seconds=30)):  # 30 second buffer for API calls
+            return self._auth_headers
         
-        if not self.access_token:
-            print("🔐 No access token - authenticating...")
-            await self.authenticate()
+        await self._ensure_fresh_token(buffer_seconds=30)
         
-        return {
-            'Authorization': f'Bearer {self.access_token}',
-            'Content-Type': 'application/json'
-        }
+        if self._auth_headers is None:
+            self._update_service_auth_state()
+        
+        return self._auth_headers
+    
+    async def _ensure_fresh_token(self, buffer_seconds: int):
+        """
+        Refresh (or authenticate) unless the token is good for buffer_seconds more
+        
+        Single-flight: callers arriving while a refresh is in flight await that same
+        task instead of queueing their own. The task is shielded, so a caller being
+        cancelled (e.g. a timed-out request) doesn't abort the refresh for the rest.
+        """
+        while True:
+            task = self._refresh_in_flight
+            if task is None or task.done():
+                task = asyncio.create_task(self._refresh_if_expiring(buffer_seconds))
+                self._refresh_in_flight = task
+                await asyncio.shield(task)
+                return
+            
+            await asyncio.shield(task)
+            # The finished refresh may have used a smaller buffer than ours
+            if self.access_token and not self.is_token_expired(buffer_seconds=buffer_seconds):
+                return
+    
+    async def _refresh_if_expiring(self, buffer_seconds: int):
+        """Body of the in-flight refresh; the expiry check is repeated under the lock"""
+        async with self._auth_lock:
+            if self.is_token_expired(buffer_seconds=buffer_seconds):
+                logger.info("🔄 Token expired or expiring soon - refreshing...")
+                await self._refresh_access_token()
+            
+            if not self.access_token:
+                logger.info("🔐 No access token - authenticating...")
+                await self.authenticate()
     
     async def _start_refresh_task(self):
         """Start the background token refresh task"""
         if self.refresh_task and not self.refresh_task.done():
             self.refresh_task.cancel()
         
+        self._stop_refresh.clear()
         self.refresh_task = asyncio.create_task(self._refresh_loop())
-        print(f"🔄 Started auto-refresh task (will refresh {self.refresh_buffer_seconds}s before expiry)")
+        logger.info("🔄 Started auto-refresh task (will refresh %ss before expiry)", self.refresh_buffer_seconds)
+    
+    async def _sleep_unless_stopped(self, seconds: float) -> bool:
+        """Sleep for seconds; returns False early if stop_refresh_task() was called"""
+        try:
+            await asyncio.wait_for(self._stop_refresh.wait(), timeout=seconds)
+            return False
+        except asyncio.TimeoutError:
+            return self.refresh_running
     
     async def _refresh_loop(self):
-        """Background task that refreshes tokens automatically"""
+        """
+        Background task that refreshes tokens automatically
+        
+        Sleeps straight through to refresh_buffer_seconds before expiry - the
+        deadline is monotonic, so no periodic re-check of the clock is needed.
+        """
         self.refresh_running = True
         
         try:
             while self.refresh_running and self.is_authenticated:
-                # Calculate when to refresh (2 minutes before expiry)
                 time_until_refresh = self.time_until_expiry() - self.refresh_buffer_seconds
                 
-                if time_until_refresh <= 0:
-                    # Token is about to expire - refresh now
-                    print("⏰ Token approaching expiry - auto-refreshing...")
-                    await self.refresh_access_token()
-                    time_until_refresh = self.time_until_expiry() - self.refresh_buffer_seconds
-                
                 if time_until_refresh > 0:
-                    print(f"🔄 Next auto-refresh in {time_until_refresh / 60:.1f} minutes")
-                    await asyncio.sleep(min(time_until_refresh, 300))  # Check at least every 5 minutes
-                else:
-                    await asyncio.sleep(60)  # Check again in 1 minute
+                    logger.info("🔄 Next auto-refresh in %.1f minutes", time_until_refresh / 60)
+                    if not await self._sleep_unless_stopped(time_until_refresh):
+                        break
+                
+                # Token is about to expire - refresh now (no-op if a request already did)
+                logger.info("⏰ Token approaching expiry - auto-refreshing...")
+                await self._ensure_fresh_token(buffer_seconds=self.refresh_buffer_seconds)
+                
+                if self.time_until_expiry() <= self.refresh_buffer_seconds:
+                    # Refresh didn't buy more than the buffer - don't spin, retry in a minute
+                    if not await self._sleep_unless_stopped(60):
+                        break
                     
         except asyncio.CancelledError:
-            print("🛑 Auto-refresh task cancelled")
+            logger.info("🛑 Auto-refresh task cancelled")
         except Exception as e:
-            print(f"❌ Error in refresh loop: {e}")
+            logger.error("❌ Error in refresh loop: %s", e)
             # Try to restart the loop after a delay
-            await asyncio.sleep(60)
-            if self.refresh_running:
+            if await self._sleep_unless_stopped(60):
                 await self._start_refresh_task()
         finally:
             self.refresh_running = False
@@ -252,13 +450,17 @@ class ProphetXAuthManager:
     async def stop_refresh_task(self):
         """Stop the background refresh task"""
         self.refresh_running = False
+        self._stop_refresh.set()
         if self.refresh_task and not self.refresh_task.done():
-            self.refresh_task.cancel()
-            try:
-                await self.refresh_task
-            except asyncio.CancelledError:
-                pass
-        print("🛑 Auto-refresh task stopped")
+            # The loop exits on its own unless it's mid-refresh; don't wait on that
+            await asyncio.wait({self.refresh_task}, timeout=1)
+            if not self.refresh_task.done():
+                self.refresh_task.cancel()
+                try:
+                    await self.refresh_task
+                except asyncio.CancelledError:
+                    pass
+        logger.info("🛑 Auto-refresh task stopped")
     
     def get_auth_status(self) -> Dict[str, Any]:
         """Get current authentication status"""
@@ -268,9 +470,8 @@ class ProphetXAuthManager:
                 "message": "Not authenticated"
             }
         
-        current_time = time.time()
-        time_until_expiry = max(0, self.access_expire_time - current_time)
-        time_until_refresh_expiry = max(0, self.refresh_expire_time - current_time)
+        time_until_expiry = self.time_until_expiry()
+        time_until_refresh_expiry = max(0, self.refresh_expire_time - time.time())
         
         return {
             "authenticated": True,
@@ -282,6 +483,17 @@ class ProphetXAuthManager:
             "environment": "sandbox" if self.sandbox else "production"
         }
 
+@dataclass(slots=True, frozen=True)
+class LineInfo:
+    """One selection's line within an event's markets"""
+    line_id: Optional[str]
+    selection_name: Optional[str]
+    odds: Optional[int]
+    point: float
+    market_type: Optional[str]
+    market_name: Optional[str]
+    status: str
+
 class ProphetXService:
     """Service with complete ProphetX API coverage"""
 
@@ -303,7 +515,163 @@ class ProphetXService:
 
         # Initialize authentication manager
         self.auth_manager = ProphetXAuthManager(self)
+        
+        # Shared HTTP client (created lazily, keeps connections alive between calls)
+        self._client: Optional[httpx.AsyncClient] = None
+        
+        # Backpressure on concurrent requests, adapted to 429/5xx responses
+        self.rate_limiter = AIMDConcurrencyLimiter(max_limit=self.settings.max_concurrent_requests)
+        
+        # Steady cap on request starts per second, taken before a concurrency slot
+        self.request_rate = TokenBucketRateLimiter(rate=self.settings.prophetx_requests_per_second)
+        
+        # Retries for throttled/failed requests (429 for any method; 5xx and network errors for GETs only)
+        self.max_request_retries = 3
+        self.retry_backoff_base = 0.25  # seconds, doubled per attempt with full jitter
+        
+        # Max in-flight cancel requests for bulk cancels
+        self.cancel_concurrency = 10
+        
+        # Where each wager-list endpoint puts its wagers, learned from its first response
+        self._wager_list_paths: Dict[str, Tuple[str, ...]] = {}
+        self.max_wager_pages = 50  # next_cursor pages followed per wager-list fetch (limit=1000 each)
+        
+        # Single-wager lookups: wager_id -> (time.monotonic() when fetched, wager)
+        self._wager_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self.open_wager_cache_ttl = 2.0  # seconds - open wagers can fill at any moment
+        self.final_wager_cache_ttl = 60.0  # seconds - settled/cancelled wagers won't change
+        self.max_wager_cache_entries = 1024
+        
+        # Short-lived read caches so repeat lookups within one cycle stay in memory:
+        # line_id -> (time.monotonic() when fetched, line), event_id -> (fetched, lines),
+        # (include_matched, days_back) -> (fetched, wagers)
+        self._line_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._event_lines_cache: Dict[int, Tuple[float, List[LineInfo]]] = {}
+        self._wagers_cache: Dict[Tuple[bool, int], Tuple[float, List[Dict[str, Any]]]] = {}
+        self.line_cache_ttl = 30.0  # seconds - line metadata
+        self.wagers_cache_ttl = 5.0  # seconds - our wager lists (also dropped on place/cancel)
+        self.max_line_cache_entries = 1024
+        self._event_lines_etags: Dict[int, str] = {}  # event_id -> ETag of the cached lines
+        # get_my_wagers_by_line index: (wager cache entry it was built from, line_id -> wagers)
+        self._wagers_by_line_index: Optional[Tuple[Tuple, Dict[str, List[Dict[str, Any]]]]] = None
+        self._cache_generation = 0  # bumped by invalidate(), so fetches that raced a change aren't cached
+        
+        # Last 200 response per GET URL that carried an ETag: url -> (etag, response)
+        self._etag_responses: Dict[str, Tuple[str, httpx.Response]] = {}
+        self.max_etag_entries = 256
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared async HTTP client used for all ProphetX API calls"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=30.0,
+                # Keep idle connections well past httpx's 5s default so bursts a poll
+                # cycle apart reuse the TLS connection instead of handshaking again
+                limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60.0)
+            )
+        return self._client
+
+    async def startup(self):
+        """Create the shared HTTP client in the app's event loop (called from the lifespan)"""
+        return self.client
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a ProphetX API request through the shared client, with adaptive backpressure
+        
+        Throttled (429) requests are retried for any method, since the server
+        didn't act on them. 5xx responses and network errors are only retried for
+        GETs - a POST that failed that way may still have placed or cancelled a
+        wager. Retries back off exponentially with full jitter; a Retry-After is
+        honored by the concurrency limiter before the retry is sent.
+        """
+        idempotent = method.upper() == "GET"
+        attempt = 0
+        
+        while True:
+            await self.request_rate.acquire()
+            async with self.rate_limiter:
+                try:
+                    response = await self.client.request(method, url, **kwargs)
+                except httpx.TransportError:
+                    self.rate_limiter.on_error()
+                    if not idempotent or attempt >= self.max_request_retries:
+                        raise
+                    response = None
+                else:
+                    if response.status_code == 429 or response.status_code >= 500:
+                        self.rate_limiter.on_error(_parse_retry_after(response.headers.get('Retry-After')))
+                        logger.warning("⚠️ ProphetX HTTP %s - request concurrency reduced to %s", response.status_code, int(self.rate_limiter.limit))
+                    else:
+                        self.rate_limiter.on_success()
+                        return response
+            
+            retryable = response is None or response.status_code == 429 or idempotent
+            if not retryable or attempt >= self.max_request_retries:
+                return response
+            
+            attempt += 1
+            await asyncio.sleep(random.uniform(0, self.retry_backoff_base * 2 ** attempt))
+
+    async def conditional_get(self, url: str, headers: Optional[Dict[str, str]] = None,
+                              params: Optional[Dict[str, Any]] = None, **kwargs) -> httpx.Response:
+        """
+        GET that revalidates with the ETag from the last response for the same URL
+        
+        A 304 answer returns that earlier 200 response, so the body is neither
+        transferred nor needs to be re-read by the caller. Only use it for URLs
+        that repeat (tournaments, markets) - queries carrying a moving from/to
+        window never match a stored entry and would just evict useful ones.
+        """
+        key = str(httpx.URL(url, params=params))
+        cached = self._etag_responses.get(key)
+        if cached is not None:
+            headers = {**(headers or {}), 'If-None-Match': cached[0]}
+        
+        response = await self.request("GET", url, headers=headers, params=params, **kwargs)
+        
+        if response.status_code == 304 and cached is not None:
+            return cached[1]
+        
+        if response.status_code == 200:
+            etag = response.headers.get('ETag')
+            if etag:
+                self._etag_responses.pop(key, None)
+                self._etag_responses[key] = (etag, response)
+                while len(self._etag_responses) > self.max_etag_entries:
+                    del self._etag_responses[next(iter(self._etag_responses))]
+            else:
+                self._etag_responses.pop(key, None)
+        
+        return response
+
+    def _cache_put(self, cache: Dict, key, value, max_entries: int):
+        """Store value with the current time, evicting the oldest entries past max_entries"""
+        cache.pop(key, None)
+        cache[key] = (time.monotonic(), value)
+        while len(cache) > max_entries:
+            del cache[next(iter(cache))]
+
+    def invalidate(self, line_id: Optional[str] = None):
+        """
+        Drop cached reads that a placement or cancellation has made stale
+        
+        Args:
+            line_id: Line the change was on, if known
+        """
+        self._cache_generation += 1
+        self._wagers_cache.clear()
+        self._wagers_by_line_index = None
+        if line_id is not None:
+            self._line_cache.pop(line_id, None)
 
+    async def aclose(self):
+        """Close the shared HTTP client"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
 
     # ============================================================================
     # AUTHENTICATION METHODS (keep existing ones)
@@ -327,12 +695,12 @@ class ProphetXService:
 
     async def start_auth_monitoring(self):
         """Start automatic token refresh monitoring"""
-        print("🚀 Starting ProphetX authentication monitoring...")
+        logger.info("🚀 Starting ProphetX authentication monitoring...")
         await self.auth_manager.authenticate()
 
     async def stop_auth_monitoring(self):
         """Stop automatic token refresh monitoring"""
-        print("🛑 Stopping ProphetX authentication monitoring...")
+        logger.info("🛑 Stopping ProphetX authentication monitoring...")
         await self.auth_manager.stop_refresh_task()
 
     # ============================================================================
@@ -349,30 +717,35 @@ class ProphetXService:
         Returns:
             Line details including current odds, status, liquidity, etc.
         """
+        cached = self._line_cache.get(line_id)
+        if cached is not None and time.monotonic() - cached[0] < self.line_cache_ttl:
+            return cached[1]
+        
         try:
             headers = await self.get_auth_headers()
             url = f"{self.base_url}/partner/mm/get_line/{line_id}"
             
-            response = requests.get(url, headers=headers)
+            response = await self.request("GET", url, headers=headers)
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 line_data = data.get('data', {})
+                self._cache_put(self._line_cache, line_id, line_data, self.max_line_cache_entries)
                 
-                print(f"📏 Line {line_id[-8:]}: {line_data.get('selection_name', 'Unknown')} @ {line_data.get('odds', 'N/A')}")
+                logger.info("📏 Line %s: %s @ %s", line_id[-8:], line_data.get('selection_name', 'Unknown'), line_data.get('odds', 'N/A'))
                 return line_data
             elif response.status_code == 404:
-                print(f"📏 Line {line_id[-8:]}: Not found (404)")
+                logger.info("📏 Line %s: Not found (404)", line_id[-8:])
                 return None
             else:
-                print(f"❌ Error getting line {line_id}: HTTP {response.status_code}")
+                logger.error("❌ Error getting line %s: HTTP %s", line_id, response.status_code)
                 return None
                 
         except Exception as e:
-            print(f"❌ Exception getting line {line_id}: {e}")
+            logger.error("❌ Exception getting line %s: %s", line_id, e)
             return None
 
-    async def get_lines_for_event(self, event_id: int) -> List[Dict[str, Any]]:
+    async def get_lines_for_event(self, event_id: int) -> List[LineInfo]:
         """
         Get all betting lines for a specific event
         
@@ -382,15 +755,28 @@ class ProphetXService:
         Returns:
             List of all lines for this event across all markets
         """
+        cached = self._event_lines_cache.get(event_id)
+        if cached is not None and time.monotonic() - cached[0] < self.line_cache_ttl:
+            return list(cached[1])
+        
         try:
             headers = await self.get_auth_headers()
             url = f"{self.base_url}/partner/v2/mm/get_markets"
             params = {"event_id": event_id}
             
-            response = requests.get(url, headers=headers, params=params)
+            # Revalidate lines we still hold; a 304 skips the body and the parse below
+            etag = self._event_lines_etags.get(event_id)
+            if etag is not None and cached is not None:
+                headers = {**headers, 'If-None-Match': etag}
+            
+            response = await self.request("GET", url, headers=headers, params=params)
+            
+            if response.status_code == 304 and cached is not None:
+                self._cache_put(self._event_lines_cache, event_id, cached[1], self.max_line_cache_entries)
+                return list(cached[1])
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 markets = data.get('data', {}).get('markets', [])
                 
                 all_lines = []
@@ -400,25 +786,37 @@ class ProphetXService:
                         for selection_group in market.get('selections', []):
                             if isinstance(selection_group, list):
                                 for selection in selection_group:
-                                    line_info = {
-                                        'line_id': selection.get('line_id'),
-                                        'selection_name': selection.get('name'),
-                                        'odds': selection.get('odds'),
-                                        'point': selection.get('line', 0),
-                                        'market_type': market.get('type'),
-                                        'market_name': market.get('name'),
-                                        'status': 'active' if selection.get('odds') is not None else 'inactive'
-                                    }
-                                    all_lines.append(line_info)
+                                    odds = selection.get('odds')
+                                    all_lines.append(LineInfo(
+                                        line_id=selection.get('line_id'),
+                                        selection_name=selection.get('name'),
+                                        odds=odds,
+                                        point=selection.get('line', 0),
+                                        market_type=market.get('type'),
+                                        market_name=market.get('name'),
+                                        status='active' if odds is not None else 'inactive'
+                                    ))
                 
-                print(f"📋 Event {event_id}: Found {len(all_lines)} total lines")
-                return all_lines
+                self._cache_put(self._event_lines_cache, event_id, all_lines, self.max_line_cache_entries)
+                etag = response.headers.get('ETag')
+                if etag:
+                    self._event_lines_etags[event_id] = etag
+                else:
+                    self._event_lines_etags.pop(event_id, None)
+                if len(self._event_lines_etags) > self.max_line_cache_entries:
+                    self._event_lines_etags = {
+                        key: value for key, value in self._event_lines_etags.items()
+                        if key in self._event_lines_cache
+                    }
+                
+                logger.info("📋 Event %s: Found %d total lines", event_id, len(all_lines))
+                return list(all_lines)
             else:
-                print(f"❌ Error getting lines for event {event_id}: HTTP {response.status_code}")
+                logger.error("❌ Error getting lines for event %s: HTTP %s", event_id, response.status_code)
                 return []
                 
         except Exception as e:
-            print(f"❌ Exception getting lines for event {event_id}: {e}")
+            logger.error("❌ Exception getting lines for event %s: %s", event_id, e)
             return []
 
     async def get_my_bets_for_line(self, line_id: str) -> List[Dict[str, Any]]:
@@ -432,26 +830,47 @@ class ProphetXService:
             List of our bets on this specific line
         """
         try:
-            # Get all our wager histories and filter by line_id
-            all_wagers = await self.get_all_my_wagers(include_matched=True)
-            
-            line_bets = []
-            for wager in all_wagers:
-                if wager.get('line_id') == line_id:
-                    line_bets.append(wager)
+            wagers_by_line = await self.get_my_wagers_by_line()
+            line_bets = list(wagers_by_line.get(line_id, ()))
             
-            print(f"🎯 Line {line_id[-8:]}: Found {len(line_bets)} of our bets")
+            logger.info("🎯 Line %s: Found %d of our bets", line_id[-8:], len(line_bets))
             return line_bets
             
         except Exception as e:
-            print(f"❌ Exception getting our bets for line {line_id}: {e}")
+            logger.error("❌ Exception getting our bets for line %s: %s", line_id, e)
             return []
 
+    async def get_my_wagers_by_line(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get all of our wagers (active and matched) grouped by line_id
+        
+        The index is built once per cached wager list and shared until that list
+        expires or is invalidated - treat it as read-only.
+        
+        Returns:
+            line_id -> our wagers on that line
+        """
+        wagers = await self.get_all_my_wagers(include_matched=True, days_back=WAGER_HISTORY_DAYS_BACK)
+        
+        # Reuse the index if the wagers above came from the still-fresh cache entry it was built from
+        entry = self._wagers_cache.get(_wagers_cache_key(True, WAGER_HISTORY_DAYS_BACK))
+        fresh = entry is not None and time.monotonic() - entry[0] < self.wagers_cache_ttl
+        if fresh and self._wagers_by_line_index is not None and self._wagers_by_line_index[0] is entry:
+            return self._wagers_by_line_index[1]
+        
+        wagers_by_line: Dict[str, List[Dict[str, Any]]] = {}
+        for wager in wagers:
+            wagers_by_line.setdefault(wager.get('line_id'), []).append(wager)
+        
+        self._wagers_by_line_index = (entry, wagers_by_line) if fresh else None
+        return wagers_by_line
+
     # ============================================================================
     # COMPREHENSIVE WAGER MANAGEMENT
     # ============================================================================
     
-    async def get_all_my_wagers(self, include_matched: bool = True, days_back: int = 7) -> List[Dict[str, Any]]:
+    async def get_all_my_wagers(self, include_matched: bool = True,
+                                days_back: int = WAGER_HISTORY_DAYS_BACK) -> List[Dict[str, Any]]:
         """
         Get ALL of our wagers (active, matched, cancelled, etc.) with better filtering
         
@@ -462,82 +881,180 @@ class ProphetXService:
         Returns:
             Comprehensive list of all our wagers
         """
+        cache_key = _wagers_cache_key(include_matched, days_back)
+        cached = self._wagers_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < self.wagers_cache_ttl:
+            return list(cached[1])
+        
+        generation = self._cache_generation
+        
         try:
             headers = await self.get_auth_headers()
             
-            # Calculate date range
+            # Calculate date range once; both endpoints query the same window
             now_timestamp = int(time.time())
-            days_ago_timestamp = now_timestamp - (days_back * 24 * 60 * 60)
-            
-            all_wagers = []
-            
-            # Get active (unmatched) wagers
-            print(f"📊 Fetching active wagers from last {days_back} days...")
-            active_url = f"{self.base_url}/partner/v2/mm/get_wager_histories"
-            active_params = {
-                "from": days_ago_timestamp,
+            window_params = {
+                "from": now_timestamp - days_back * 86400,
                 "to": now_timestamp,
-                "matching_status": "unmatched",
-                "status": "open",
                 "limit": 1000
             }
             
-            response = requests.get(active_url, headers=headers, params=active_params)
-            if response.status_code == 200:
-                data = response.json()
-                wagers = self._extract_wagers_from_response(data)
-                all_wagers.extend(wagers)
-                print(f"   ✅ Found {len(wagers)} active wagers")
+            # Active (unmatched) and matched wagers come from independent endpoints - fetch both at once
+            logger.info("📊 Fetching %s wagers from last %s days...", "active and matched" if include_matched else "active", days_back)
+            active_url = f"{self.base_url}/partner/v2/mm/get_wager_histories"
+            active_params = {**window_params, "matching_status": "unmatched", "status": "open"}
+            fetches = [self._fetch_wager_list(active_url, headers, active_params)]
             
-            # Get matched wagers if requested
             if include_matched:
-                print(f"📊 Fetching matched wagers from last {days_back} days...")
                 matched_url = f"{self.base_url}/partner/mm/get_matched_bets"
-                matched_params = {
-                    "from": days_ago_timestamp,
-                    "to": now_timestamp,
-                    "limit": 1000
-                }
-                
-                response = requests.get(matched_url, headers=headers, params=matched_params)
-                if response.status_code == 200:
-                    data = response.json()
-                    matched_wagers = self._extract_wagers_from_response(data)
-                    all_wagers.extend(matched_wagers)
-                    print(f"   ✅ Found {len(matched_wagers)} matched wagers")
+                fetches.append(self._fetch_wager_list(matched_url, headers, window_params))
+            
+            results = await asyncio.gather(*fetches)
+            
+            all_wagers = []
+            complete = True
+            for kind, wagers in zip(("active", "matched"), results):
+                if wagers is None:
+                    complete = False
+                    continue
+                all_wagers.extend(wagers)
+                logger.debug("   ✅ Found %d %s wagers", len(wagers), kind)
+            
+            if complete and generation == self._cache_generation:
+                self._cache_put(self._wagers_cache, cache_key, all_wagers, self.max_line_cache_entries)
             
-            print(f"📊 Total wagers retrieved: {len(all_wagers)}")
-            return all_wagers
+            logger.info("📊 Total wagers retrieved: %d", len(all_wagers))
+            return list(all_wagers)
             
         except Exception as e:
-            print(f"❌ Exception getting all wagers: {e}")
+            logger.error("❌ Exception getting all wagers: %s", e)
             return []
 
-    def _extract_wagers_from_response(self, data) -> List[Dict[str, Any]]:
-        """Extract wagers from various ProphetX response formats"""
-        wagers = []
+    async def _fetch_wager_list(self, url: str, headers: Dict[str, str],
+                                params: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        GET one wager-list endpoint, following next_cursor through every page
+        
+        Returns None unless every page answered 200. Each page's cursor comes from
+        the page before it, so the pages are fetched one after another.
+        """
+        wagers: List[Dict[str, Any]] = []
+        page_params = params
+        seen_cursors = set()
+        
+        for _ in range(self.max_wager_pages):
+            # Plain GET: the moving from/to window means there's never an ETag to revalidate
+            response = await self.request("GET", url, headers=headers, params=page_params)
+            if response.status_code != 200:
+                return None
+            
+            data = orjson.loads(response.content)
+            wagers.extend(self._extract_wagers_from_response(data, url))
+            
+            inner = data.get('data') if isinstance(data, dict) else None
+            cursor = inner.get('next_cursor') if isinstance(inner, dict) else None
+            if not cursor or cursor in seen_cursors:
+                return wagers
+            seen_cursors.add(cursor)
+            page_params = {**params, "next_cursor": cursor}
+        
+        logger.warning("⚠️ Stopped after %d pages of %s - wager list may be incomplete", self.max_wager_pages, url)
+        return wagers
+
+    def _extract_wagers_from_response(self, data, endpoint: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Extract wagers from a ProphetX response
         
+        The first response from each endpoint is probed for where its wager list
+        lives; later responses follow that remembered path directly and only fall
+        back to probing if the layout no longer fits.
+        """
+        path = self._wager_list_paths.get(endpoint) if endpoint else None
+        if path is not None:
+            try:
+                wagers = data
+                for key in path:
+                    wagers = wagers[key]
+                if isinstance(wagers, list):
+                    return wagers
+            except (KeyError, TypeError):
+                pass
+        
+        path = self._find_wager_list_path(data)
+        if path is None:
+            return []
+        if endpoint:
+            self._wager_list_paths[endpoint] = path
+        
+        wagers = data
+        for key in path:
+            wagers = wagers[key]
+        return wagers
+
+    def _find_wager_list_path(self, data) -> Optional[Tuple[str, ...]]:
+        """Probe the various ProphetX response formats for the key path to the wager list"""
         if isinstance(data, dict):
             if 'data' in data:
                 inner_data = data['data']
                 if isinstance(inner_data, list):
-                    wagers = inner_data
+                    return ('data',)
                 elif isinstance(inner_data, dict):
                     # Try common field names
                     for field in ['wagers', 'bets', 'matches', 'histories']:
                         if field in inner_data and isinstance(inner_data[field], list):
-                            wagers = inner_data[field]
-                            break
+                            return ('data', field)
             else:
                 # Try direct field access
                 for key, value in data.items():
                     if isinstance(value, list) and value:
-                        wagers = value
-                        break
+                        return (key,)
         elif isinstance(data, list):
-            wagers = data
+            return ()
         
-        return wagers
+        return None
+
+    async def get_wager_by_id(self, wager_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a single wager by its ProphetX ID, briefly cached
+        
+        Args:
+            wager_id: ProphetX wager ID
+            
+        Returns:
+            Wager data, or None if ProphetX doesn't know the wager (404)
+        """
+        cached = self._wager_cache.get(wager_id)
+        if cached is not None:
+            fetched_at, wager = cached
+            status = str(wager.get('status', '')).lower()
+            ttl = self.final_wager_cache_ttl if status in FINAL_WAGER_STATUSES else self.open_wager_cache_ttl
+            if time.monotonic() - fetched_at < ttl:
+                return wager
+        
+        headers = await self.get_auth_headers()
+        url = f"{self.base_url}/partner/mm/get_wager/{wager_id}"
+        response = await self.request("GET", url, headers=headers)
+        
+        if response.status_code == 200:
+            wager = orjson.loads(response.content).get('data', {})
+            now = time.monotonic()
+            if len(self._wager_cache) >= self.max_wager_cache_entries:
+                # Nothing older than the longest TTL can still be served
+                self._wager_cache = {
+                    key: entry for key, entry in self._wager_cache.items()
+                    if now - entry[0] < self.final_wager_cache_ttl
+                }
+            self._wager_cache[wager_id] = (now, wager)
+            return wager
+        
+        self._wager_cache.pop(wager_id, None)
+        if response.status_code == 404:
+            return None
+        
+        raise HTTPException(
+            status_code=response.status_code,
+            detail=f"Error getting wager {wager_id}: HTTP {response.status_code}: {response.text}"
+        )
 
     async def get_wager_details_comprehensive(self, wager_id: str) -> Dict[str, Any]:
         """
@@ -561,18 +1078,18 @@ class ProphetXService:
             
             # Method 1: Direct wager lookup
             url = f"{self.base_url}/partner/mm/get_wager/{wager_id}"
-            response = requests.get(url, headers=headers)
+            response = await self.request("GET", url, headers=headers)
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 result["found_via"] = "direct_lookup"
                 result["details"] = data.get('data', {})
                 result["status"] = "found"
-                print(f"📋 Wager {wager_id[-8:]}: Found via direct lookup")
+                logger.info("📋 Wager %s: Found via direct lookup", wager_id[-8:])
                 return result
             
             # Method 2: Search in all active wagers
-            print(f"🔍 Searching for wager {wager_id[-8:]} in active wagers...")
+            logger.info("🔍 Searching for wager %s in active wagers...", wager_id[-8:])
             active_wagers = await self.get_all_my_wagers(include_matched=False)
             
             for wager in active_wagers:
@@ -581,11 +1098,11 @@ class ProphetXService:
                     result["found_via"] = "active_search"
                     result["details"] = wager
                     result["status"] = "found_active"
-                    print(f"📋 Wager {wager_id[-8:]}: Found in active wagers")
+                    logger.info("📋 Wager %s: Found in active wagers", wager_id[-8:])
                     return result
             
             # Method 3: Search in matched bets
-            print(f"🔍 Searching for wager {wager_id[-8:]} in matched bets...")
+            logger.info("🔍 Searching for wager %s in matched bets...", wager_id[-8:])
             matched_wagers = await self.get_all_my_wagers(include_matched=True, days_back=1)
             
             for wager in matched_wagers:
@@ -594,14 +1111,14 @@ class ProphetXService:
                     result["found_via"] = "matched_search"
                     result["details"] = wager
                     result["status"] = "found_matched"
-                    print(f"📋 Wager {wager_id[-8:]}: Found in matched bets")
+                    logger.info("📋 Wager %s: Found in matched bets", wager_id[-8:])
                     return result
             
-            print(f"❌ Wager {wager_id[-8:]}: Not found anywhere")
+            logger.error("❌ Wager %s: Not found anywhere", wager_id[-8:])
             return result
             
         except Exception as e:
-            print(f"❌ Exception in comprehensive wager lookup: {e}")
+            logger.error("❌ Exception in comprehensive wager lookup: %s", e)
             result["status"] = "error"
             result["error"] = str(e)
             return result
@@ -621,8 +1138,11 @@ class ProphetXService:
             Summary of all positions/exposure for this event
         """
         try:
-            # Get all lines for this event
-            event_lines = await self.get_lines_for_event(event_id)
+            # Get all lines for this event, and all our wagers indexed by line once (independent - fetch together)
+            event_lines, wagers_by_line = await asyncio.gather(
+                self.get_lines_for_event(event_id),
+                self.get_my_wagers_by_line()
+            )
             
             position_summary = {
                 "event_id": event_id,
@@ -636,11 +1156,11 @@ class ProphetXService:
             
             # For each line, get our bet details
             for line in event_lines:
-                line_id = line.get('line_id')
+                line_id = line.line_id
                 if not line_id:
                     continue
                 
-                our_bets = await self.get_my_bets_for_line(line_id)
+                our_bets = wagers_by_line.get(line_id)
                 
                 if our_bets:
                     position_summary["lines_with_bets"] += 1
@@ -654,26 +1174,26 @@ class ProphetXService:
                     position_summary["total_unmatched"] += line_unmatched
                     
                     position_summary["line_details"][line_id] = {
-                        "selection_name": line.get('selection_name'),
-                        "market_type": line.get('market_type'),
-                        "current_odds": line.get('odds'),
+                        "selection_name": line.selection_name,
+                        "market_type": line.market_type,
+                        "current_odds": line.odds,
                         "our_bets_count": len(our_bets),
                         "total_stake": line_stake,
                         "matched_stake": line_matched,
                         "unmatched_stake": line_unmatched,
-                        "line_status": line.get('status')
+                        "line_status": line.status
                     }
             
-            print(f"📊 Event {event_id} Position Summary:")
-            print(f"   Lines with bets: {position_summary['lines_with_bets']}/{position_summary['total_lines']}")
-            print(f"   Total stake: ${position_summary['total_stake']:.2f}")
-            print(f"   Matched: ${position_summary['total_matched']:.2f}")
-            print(f"   Unmatched: ${position_summary['total_unmatched']:.2f}")
+            logger.info(
+                "📊 Event %s Position Summary: lines with bets %s/%s, stake $%.2f, matched $%.2f, unmatched $%.2f",
+                event_id, position_summary['lines_with_bets'], position_summary['total_lines'],
+                position_summary['total_stake'], position_summary['total_matched'], position_summary['total_unmatched']
+            )
             
             return position_summary
             
         except Exception as e:
-            print(f"❌ Exception getting position summary for event {event_id}: {e}")
+            logger.error("❌ Exception getting position summary for event %s: %s", event_id, e)
             return {"error": str(e)}
 
     # ============================================================================
@@ -692,31 +1212,37 @@ class ProphetXService:
         """
         try:
             if self.settings.dry_run_mode:
-                print(f"🧪 [DRY RUN] Would cancel all bets for event {event_id}")
+                logger.info("🧪 [DRY RUN] Would cancel all bets for event %s", event_id)
                 return {"success": True, "dry_run": True, "cancelled_count": 0}
             
-            # Get position summary to find all our bets
+            # Get position summary to find the lines with unmatched stake
             position_summary = await self.get_position_summary_for_event(event_id)
+            wagers_by_line = await self.get_my_wagers_by_line()
+            
+            bet_ids = [
+                bet.get('id')
+                for line_id, line_details in position_summary.get("line_details", {}).items()
+                if line_details["unmatched_stake"] > 0
+                for bet in wagers_by_line.get(line_id, [])
+                if bet.get('status') == 'open' and bet.get('matching_status') == 'unmatched'
+            ]
             
-            cancelled_count = 0
-            failed_count = 0
+            # Cancel concurrently, bounded to stay within ProphetX rate limits
+            semaphore = asyncio.Semaphore(self.cancel_concurrency)
             
-            for line_id, line_details in position_summary.get("line_details", {}).items():
-                if line_details["unmatched_stake"] > 0:
-                    # Get our bets for this line
-                    our_bets = await self.get_my_bets_for_line(line_id)
-                    
-                    for bet in our_bets:
-                        if bet.get('status') == 'open' and bet.get('matching_status') == 'unmatched':
-                            bet_id = bet.get('id')
-                            cancel_result = await self.cancel_wager(bet_id)
-                            
-                            if cancel_result.get("success"):
-                                cancelled_count += 1
-                            else:
-                                failed_count += 1
-            
-            print(f"🗑️ Event {event_id}: Cancelled {cancelled_count} bets, {failed_count} failed")
+            async def cancel(bet_id):
+                async with semaphore:
+                    return await self.cancel_wager(bet_id)
+            
+            results = await asyncio.gather(*(cancel(bet_id) for bet_id in bet_ids), return_exceptions=True)
+            
+            cancelled_count = sum(
+                1 for result in results
+                if not isinstance(result, BaseException) and result.get("success")
+            )
+            failed_count = len(results) - cancelled_count
+            
+            logger.info("🗑️ Event %s: Cancelled %s bets, %s failed", event_id, cancelled_count, failed_count)
             
             return {
                 "success": True,
@@ -726,7 +1252,7 @@ class ProphetXService:
             }
             
         except Exception as e:
-            print(f"❌ Exception cancelling bets for event {event_id}: {e}")
+            logger.error("❌ Exception cancelling bets for event %s: %s", event_id, e)
             return {"success": False, "error": str(e)}
 
     async def get_lines_needing_liquidity(self, event_id: int, max_position_per_line: float = 500.0) -> List[Dict[str, Any]]:
@@ -772,12 +1298,12 @@ class ProphetXService:
             # Sort by priority (less unmatched stake = higher priority for more liquidity)
             lines_needing_liquidity.sort(key=lambda x: x["priority"])
             
-            print(f"📈 Event {event_id}: {len(lines_needing_liquidity)} lines need more liquidity")
+            logger.info("📈 Event %s: %d lines need more liquidity", event_id, len(lines_needing_liquidity))
             
             return lines_needing_liquidity
             
         except Exception as e:
-            print(f"❌ Exception finding lines needing liquidity: {e}")
+            logger.error("❌ Exception finding lines needing liquidity: %s", e)
             return []
 
     # ============================================================================
@@ -801,8 +1327,8 @@ class ProphetXService:
         
         try:
             # Test authentication
-            print("🔍 Running ProphetX API Diagnostics...")
-            print("1️⃣ Testing authentication...")
+            logger.info("🔍 Running ProphetX API Diagnostics...")
+            logger.info("1️⃣ Testing authentication...")
             
             auth_result = await self.authenticate()
             diagnostics["authentication"] = {
@@ -815,7 +1341,7 @@ class ProphetXService:
                 return diagnostics
             
             # Test core endpoints
-            print("2️⃣ Testing core API endpoints...")
+            logger.info("2️⃣ Testing core API endpoints...")
             
             endpoints_to_test = [
                 ("get_tournaments", "/partner/mm/get_tournaments"),
@@ -845,7 +1371,7 @@ class ProphetXService:
                             "limit": 10
                         }
                     
-                    response = requests.get(full_url, headers=headers, params=params)
+                    response = await self.request("GET", full_url, headers=headers, params=params)
                     
                     diagnostics["api_endpoints"][endpoint_name] = {
                         "status_code": response.status_code,
@@ -854,19 +1380,19 @@ class ProphetXService:
                     }
                     
                     if response.status_code == 200:
-                        print(f"   ✅ {endpoint_name}: OK")
+                        logger.debug("   ✅ %s: OK", endpoint_name)
                     else:
-                        print(f"   ❌ {endpoint_name}: HTTP {response.status_code}")
+                        logger.error("   ❌ %s: HTTP %s", endpoint_name, response.status_code)
                         
                 except Exception as e:
                     diagnostics["api_endpoints"][endpoint_name] = {
                         "success": False,
                         "error": str(e)
                     }
-                    print(f"   ❌ {endpoint_name}: Exception - {e}")
+                    logger.error("   ❌ %s: Exception - %s", endpoint_name, e)
             
             # Test data retrieval
-            print("3️⃣ Testing data retrieval...")
+            logger.info("3️⃣ Testing data retrieval...")
             
             all_wagers = await self.get_all_my_wagers(include_matched=True, days_back=1)
             diagnostics["data_quality"] = {
@@ -875,7 +1401,7 @@ class ProphetXService:
                 "matched_wagers": len([w for w in all_wagers if w.get('matching_status') in ['fully_matched', 'partially_matched']])
             }
             
-            print(f"   📊 Found {len(all_wagers)} total wagers in last 24 hours")
+            logger.debug("   📊 Found %d total wagers in last 24 hours", len(all_wagers))
             
             # Generate recommendations
             if diagnostics["data_quality"]["total_wagers_found"] == 0:
@@ -890,11 +1416,11 @@ class ProphetXService:
             if not diagnostics["recommendations"]:
                 diagnostics["recommendations"].append("All systems appear to be working correctly")
             
-            print("✅ Diagnostics complete!")
+            logger.info("✅ Diagnostics complete!")
             
         except Exception as e:
             diagnostics["error"] = str(e)
-            print(f"❌ Diagnostics failed: {e}")
+            logger.error("❌ Diagnostics failed: %s", e)
         
         return diagnostics
 
@@ -905,7 +1431,7 @@ class ProphetXService:
     async def place_bet(self, line_id: str, odds: int, stake: float, external_id: str) -> Dict[str, Any]:
         """Place a bet on ProphetX (keep existing implementation)"""
         if self.settings.dry_run_mode:
-            print(f"🧪 [DRY RUN] Would place bet: {line_id}, {odds:+d}, ${stake}")
+            logger.info("🧪 [DRY RUN] Would place bet: %s, %+d, $%s", line_id, odds, stake)
             return {
                 "success": True,
                 "bet_id": f"dry_run_{external_id}",
@@ -925,13 +1451,14 @@ class ProphetXService:
                 "stake": stake
             }
             
-            print(f"💰 Placing bet: {line_id[-8:]}, {odds:+d}, ${stake}")
+            logger.info("💰 Placing bet: %s, %+d, $%s", line_id[-8:], odds, stake)
             
-            response = requests.post(url, headers=headers, json=payload)
+            response = await self.request("POST", url, headers=headers, content=orjson.dumps(payload))
             
             if response.status_code in [200, 201]:
-                data = response.json()
-                print(f"✅ Bet placed successfully: {external_id[-8:]}")
+                data = orjson.loads(response.content)
+                logger.info("✅ Bet placed successfully: %s", external_id[-8:])
+                self.invalidate(line_id)
                 
                 return {
                     "success": True,
@@ -942,7 +1469,7 @@ class ProphetXService:
                 }
             else:
                 error_msg = f"HTTP {response.status_code}: {response.text}"
-                print(f"❌ Bet placement failed: {error_msg}")
+                logger.error("❌ Bet placement failed: %s", error_msg)
                 
                 return {
                     "success": False,
@@ -953,7 +1480,7 @@ class ProphetXService:
                 
         except Exception as e:
             error_msg = f"Exception placing bet: {str(e)}"
-            print(f"❌ {error_msg}")
+            logger.error("❌ %s", error_msg)
             
             return {
                 "success": False,
@@ -965,7 +1492,7 @@ class ProphetXService:
     async def cancel_wager(self, wager_id: str) -> Dict[str, Any]:
         """Cancel a wager (keep existing implementation)"""
         if self.settings.dry_run_mode:
-            print(f"🧪 [DRY RUN] Would cancel wager: {wager_id}")
+            logger.info("🧪 [DRY RUN] Would cancel wager: %s", wager_id)
             return {"success": True, "message": "Dry run - wager cancellation simulated", "wager_id": wager_id, "dry_run": True}
         
         try:
@@ -974,23 +1501,25 @@ class ProphetXService:
             
             payload = {"wager_id": wager_id}
             
-            print(f"❌ Cancelling wager: {wager_id[-8:]}")
+            logger.info("❌ Cancelling wager: %s", wager_id[-8:])
             
-            response = requests.post(url, headers=headers, json=payload)
+            response = await self.request("POST", url, headers=headers, content=orjson.dumps(payload))
             
             if response.status_code in [200, 201]:
-                data = response.json()
-                print(f"✅ Wager cancelled successfully: {wager_id[-8:]}")
+                data = orjson.loads(response.content)
+                logger.info("✅ Wager cancelled successfully: %s", wager_id[-8:])
+                self._wager_cache.pop(wager_id, None)
+                self.invalidate()
                 
                 return {"success": True, "wager_id": wager_id, "response_data": data, "dry_run": False}
             else:
                 error_msg = f"HTTP {response.status_code}: {response.text}"
-                print(f"❌ Wager cancellation failed: {error_msg}")
+                logger.error("❌ Wager cancellation failed: %s", error_msg)
                 return {"success": False, "error": error_msg, "wager_id": wager_id, "dry_run": False}
                 
         except Exception as e:
             error_msg = f"Exception cancelling wager: {str(e)}"
-            print(f"❌ {error_msg}")
+            logger.error("❌ %s", error_msg)
             return {"success": False, "error": error_msg, "wager_id": wager_id, "dry_run": False}
 
     async def cancel_wagers_by_market(self, event_id: int, market_id: int) -> Dict[str, Any]:
@@ -1005,7 +1534,7 @@ class ProphetXService:
             Cancellation result
         """
         if self.settings.dry_run_mode:
-            print(f"🧪 [DRY RUN] Would cancel all wagers for event {event_id}, market {market_id}")
+            logger.info("🧪 [DRY RUN] Would cancel all wagers for event %s, market %s", event_id, market_id)
             return {
                 "success": True,
                 "dry_run": True,
@@ -1021,16 +1550,18 @@ class ProphetXService:
                 "market_id": market_id
             }
             
-            print(f"🗑️ Cancelling all wagers for event {event_id}, market {market_id}")
+            logger.info("🗑️ Cancelling all wagers for event %s, market %s", event_id, market_id)
             
-            response = requests.post(url, headers=headers, json=payload)
+            response = await self.request("POST", url, headers=headers, content=orjson.dumps(payload))
             
             if response.status_code in [200, 201]:
-                data = response.json()
+                data = orjson.loads(response.content)
                 success = data.get('data', {}).get('success', False)
                 
                 if success:
-                    print(f"✅ Successfully cancelled wagers for market {market_id}")
+                    logger.info("✅ Successfully cancelled wagers for market %s", market_id)
+                    self._wager_cache.clear()  # cached wagers in this market are stale now
+                    self.invalidate()
                     return {
                         "success": True,
                         "event_id": event_id,
@@ -1039,7 +1570,7 @@ class ProphetXService:
                         "response_data": data
                     }
                 else:
-                    print(f"⚠️ Cancel request processed but success=false")
+                    logger.warning("⚠️ Cancel request processed but success=false")
                     return {
                         "success": False,
                         "error": "ProphetX returned success=false",
@@ -1047,7 +1578,7 @@ class ProphetXService:
                     }
             else:
                 error_msg = f"HTTP {response.status_code}: {response.text}"
-                print(f"❌ Cancel request failed: {error_msg}")
+                logger.error("❌ Cancel request failed: %s", error_msg)
                 return {
                     "success": False,
                     "error": error_msg,
@@ -1057,7 +1588,7 @@ class ProphetXService:
                 
         except Exception as e:
             error_msg = f"Exception cancelling wagers: {str(e)}"
-            print(f"❌ {error_msg}")
+            logger.error("❌ %s", error_msg)
             return {
                 "success": False,
                 "error": error_msg,
@@ -4,13 +4,15 @@ ProphetX Wager Retrieval Methods
 Based on actual ProphetX API documentation
 """
 
-import requests
+import logging
+import orjson
 import time
-from datetime import datetime, timezone, timedelta
 from typing import Optional, Dict, Any, List
-from fastapi import HTTPException
 
 from app.core.config import get_settings
+from app.services.prophetx_service import prophetx_service
+
+logger = logging.getLogger(__name__)
 
 class ProphetXWagerService:
     """Service focused on ProphetX wager retrieval and management"""
@@ -19,74 +21,16 @@ class ProphetXWagerService:
         self.settings = get_settings()
         self.base_url = self.settings.prophetx_base_url
         
-        # Authentication (you'll need to include your auth methods here)
-        self.access_token: Optional[str] = None
-        self.refresh_token: Optional[str] = None
-        self.access_expire_time: Optional[int] = None
-        self.refresh_expire_time: Optional[int] = None
-        self.is_authenticated = False
-        
-        self.access_key = self.settings.prophetx_access_key
-        self.secret_key = self.settings.prophetx_secret_key
+        # Authentication is shared with ProphetXService: one token, kept fresh by its background refresh
         self.sandbox = self.settings.prophetx_sandbox
 
     async def authenticate(self) -> Dict[str, Any]:
         """Authenticate with ProphetX API"""
-        print("🔐 Authenticating with ProphetX...")
-        
-        url = f"{self.base_url}/partner/auth/login"
-        payload = {
-            "access_key": self.access_key,
-            "secret_key": self.secret_key
-        }
-        
-        headers = {'Content-Type': 'application/json'}
-        
-        try:
-            response = requests.post(url, headers=headers, json=payload)
-            
-            if response.status_code == 200:
-                data = response.json()
-                token_data = data.get('data', {})
-                
-                self.access_token = token_data.get('access_token')
-                self.refresh_token = token_data.get('refresh_token')
-                self.access_expire_time = token_data.get('access_expire_time')
-                self.refresh_expire_time = token_data.get('refresh_expire_time')
-                
-                if self.access_token and self.refresh_token:
-                    self.is_authenticated = True
-                    
-                    access_expire_dt = datetime.fromtimestamp(self.access_expire_time, tz=timezone.utc)
-                    print("✅ ProphetX authentication successful!")
-                    print(f"   Environment: {'SANDBOX' if self.sandbox else 'PRODUCTION'}")
-                    print(f"   Access token expires: {access_expire_dt}")
-                    
-                    return {
-                        "success": True,
-                        "message": "Authentication successful",
-                        "access_expires_at": access_expire_dt.isoformat(),
-                        "refresh_expires_at": datetime.fromtimestamp(self.refresh_expire_time, tz=timezone.utc).isoformat()
-                    }
-                else:
-                    raise HTTPException(status_code=400, detail="Missing tokens in response")
-                    
-            else:
-                error_msg = f"HTTP {response.status_code}: {response.text}"
-                raise HTTPException(status_code=response.status_code, detail=error_msg)
-                
-        except requests.exceptions.RequestException as e:
-            raise HTTPException(status_code=500, detail=f"Network error: {str(e)}")
+        return await prophetx_service.authenticate()
 
     async def get_auth_headers(self) -> Dict[str, str]:
         """Get authentication headers for API requests"""
-        if not self.access_token:
-            await self.authenticate()
-        
-        return {
-            'Authorization': f'Bearer {self.access_token}',
-            'Content-Type': 'application/json'
-        }
+        return await prophetx_service.get_auth_headers()
 
     # ============================================================================
     # CORE WAGER RETRIEVAL METHODS
@@ -151,12 +95,13 @@ class ProphetXWagerService:
             if next_cursor is not None:
                 params["next_cursor"] = next_cursor
             
-            print(f"📊 Fetching wager histories with params: {params}")
+            logger.debug("📊 Fetching wager histories with params: %s", params)
             
-            response = requests.get(url, headers=headers, params=params)
+            # Time-windowed params never repeat, so there is no ETag to revalidate
+            response = await prophetx_service.request("GET", url, headers=headers, params=params)
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 
                 # Extract wagers from the response
                 wagers_data = data.get('data', {})
@@ -164,7 +109,7 @@ class ProphetXWagerService:
                 next_cursor = wagers_data.get('next_cursor')
                 last_synced_at = data.get('last_synced_at')
                 
-                print(f"✅ Retrieved {len(wagers)} wagers")
+                logger.info("✅ Retrieved %d wagers", len(wagers))
                 
                 return {
                     "success": True,
@@ -175,7 +120,7 @@ class ProphetXWagerService:
                 }
             else:
                 error_msg = f"HTTP {response.status_code}: {response.text}"
-                print(f"❌ Error fetching wager histories: {error_msg}")
+                logger.error("❌ Error fetching wager histories: %s", error_msg)
                 
                 return {
                     "success": False,
@@ -185,7 +130,7 @@ class ProphetXWagerService:
                 
         except Exception as e:
             error_msg = f"Exception fetching wager histories: {str(e)}"
-            print(f"❌ {error_msg}")
+            logger.error("❌ %s", error_msg)
             
             return {
                 "success": False,
@@ -207,17 +152,17 @@ class ProphetXWagerService:
             headers = await self.get_auth_headers()
             url = f"{self.base_url}/partner/mm/get_wager/{wager_id}"
             
-            print(f"🎯 Fetching wager by ID: {wager_id}")
+            logger.debug("🎯 Fetching wager by ID: %s", wager_id)
             
-            response = requests.get(url, headers=headers)
+            response = await prophetx_service.request("GET", url, headers=headers)
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 
                 wager_data = data.get('data', {})
                 last_synced_at = data.get('last_synced_at')
                 
-                print(f"✅ Retrieved wager {wager_id}")
+                logger.info("✅ Retrieved wager %s", wager_id)
                 
                 return {
                     "success": True,
@@ -225,7 +170,7 @@ class ProphetXWagerService:
                     "last_synced_at": last_synced_at
                 }
             elif response.status_code == 404:
-                print(f"❌ Wager {wager_id} not found")
+                logger.error("❌ Wager %s not found", wager_id)
                 
                 return {
                     "success": False,
@@ -234,7 +179,7 @@ class ProphetXWagerService:
                 }
             else:
                 error_msg = f"HTTP {response.status_code}: {response.text}"
-                print(f"❌ Error fetching wager {wager_id}: {error_msg}")
+                logger.error("❌ Error fetching wager %s: %s", wager_id, error_msg)
                 
                 return {
                     "success": False,
@@ -244,7 +189,7 @@ class ProphetXWagerService:
                 
         except Exception as e:
             error_msg = f"Exception fetching wager {wager_id}: {str(e)}"
-            print(f"❌ {error_msg}")
+            logger.error("❌ %s", error_msg)
             
             return {
                 "success": False,
@@ -283,19 +228,19 @@ class ProphetXWagerService:
             if next_cursor is not None:
                 params["next_cursor"] = next_cursor
             
-            print(f"🎯 Fetching wager matching details with params: {params}")
+            logger.debug("🎯 Fetching wager matching details with params: %s", params)
             
-            response = requests.get(url, headers=headers, params=params)
+            response = await prophetx_service.request("GET", url, headers=headers, params=params)
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 
                 details_data = data.get('data', {})
                 matching_details = details_data.get('matching_details', [])
                 next_cursor = details_data.get('next_cursor')
                 last_synced_at = data.get('last_synced_at')
                 
-                print(f"✅ Retrieved {len(matching_details)} matching details")
+                logger.info("✅ Retrieved %d matching details", len(matching_details))
                 
                 return {
                     "success": True,
@@ -306,7 +251,7 @@ class ProphetXWagerService:
                 }
             else:
                 error_msg = f"HTTP {response.status_code}: {response.text}"
-                print(f"❌ Error fetching matching details: {error_msg}")
+                logger.error("❌ Error fetching matching details: %s", error_msg)
                 
                 return {
                     "success": False,
@@ -316,7 +261,7 @@ class ProphetXWagerService:
                 
         except Exception as e:
             error_msg = f"Exception fetching matching details: {str(e)}"
-            print(f"❌ {error_msg}")
+            logger.error("❌ %s", error_msg)
             
             return {
                 "success": False,
@@ -338,7 +283,7 @@ class ProphetXWagerService:
         Returns:
             List of active wagers
         """
-        print(f"📊 Getting all active wagers from last {days_back} days...")
+        logger.info("📊 Getting all active wagers from last %s days...", days_back)
         
         # Calculate timestamp range
         now_timestamp = int(time.time())
@@ -353,10 +298,10 @@ class ProphetXWagerService:
         )
         
         if result["success"]:
-            print(f"✅ Found {len(result['wagers'])} active wagers")
+            logger.info("✅ Found %d active wagers", len(result['wagers']))
             return result["wagers"]
         else:
-            print(f"❌ Failed to get active wagers: {result.get('error', 'Unknown error')}")
+            logger.error("❌ Failed to get active wagers: %s", result.get('error', 'Unknown error'))
             return []
 
     async def get_all_matched_wagers(self, days_back: int = 7) -> List[Dict[str, Any]]:
@@ -369,7 +314,7 @@ class ProphetXWagerService:
         Returns:
             List of matched wagers
         """
-        print(f"🎯 Getting all matched wagers from last {days_back} days...")
+        logger.info("🎯 Getting all matched wagers from last %s days...", days_back)
         
         # Calculate timestamp range
         now_timestamp = int(time.time())
@@ -399,7 +344,7 @@ class ProphetXWagerService:
         if partially_matched["success"]:
             all_matched.extend(partially_matched["wagers"])
         
-        print(f"✅ Found {len(all_matched)} matched wagers")
+        logger.info("✅ Found %d matched wagers", len(all_matched))
         return all_matched
 
     async def get_wager_by_external_id(self, external_id: str) -> Optional[Dict[str, Any]]:
@@ -412,7 +357,7 @@ class ProphetXWagerService:
         Returns:
             Wager data if found, None otherwise
         """
-        print(f"🔍 Searching for wager with external_id: {external_id}")
+        logger.info("🔍 Searching for wager with external_id: %s", external_id)
         
         # We need to search through recent wagers since ProphetX doesn't support filtering by external_id
         # Get recent wagers (last 24 hours)
@@ -429,10 +374,10 @@ class ProphetXWagerService:
             # Search through wagers for matching external_id
             for wager in result["wagers"]:
                 if wager.get("external_id") == external_id:
-                    print(f"✅ Found wager with external_id {external_id}")
+                    logger.info("✅ Found wager with external_id %s", external_id)
                     return wager
         
-        print(f"❌ No wager found with external_id {external_id}")
+        logger.error("❌ No wager found with external_id %s", external_id)
         return None
 
     async def get_comprehensive_wager_status(self, identifier: str) -> Dict[str, Any]:
@@ -445,7 +390,7 @@ class ProphetXWagerService:
         Returns:
             Comprehensive wager status information
         """
-        print(f"🔍 Getting comprehensive status for wager: {identifier}")
+        logger.info("🔍 Getting comprehensive status for wager: %s", identifier)
         
         result = {
             "identifier": identifier,
@@ -59,6 +59,33 @@ class TeeLogger:
                 self.file_handle.close()
                 self.file_handle = None
 
+class CurrentStdoutHandler(logging.StreamHandler):
+    """StreamHandler that writes to whatever sys.stdout is at emit time (the TeeLogger once installed)"""
+    
+    @property
+    def stream(self):
+        return sys.stdout
+    
+    @stream.setter
+    def stream(self, value):
+        pass  # Always follow sys.stdout
+
+def setup_app_logger(level: str = "INFO") -> logging.Logger:
+    """
+    Route the app's module loggers (logging.getLogger(__name__) under app.*) to stdout
+    
+    Only the "app" logger is touched - the root logger stays uvicorn's. Messages
+    print bare, like the rest of the console output; the TeeLogger adds the
+    timestamp in the log file. Safe to call again to change the level.
+    """
+    app_logger = logging.getLogger("app")
+    if not any(isinstance(handler, CurrentStdoutHandler) for handler in app_logger.handlers):
+        handler = CurrentStdoutHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        app_logger.addHandler(handler)
+    app_logger.setLevel(level.upper())
+    return app_logger
+
 class FastAPICompatibleLogging:
     """FastAPI-compatible logging setup that doesn't interfere with uvicorn"""
     
@@ -99,6 +126,9 @@ class FastAPICompatibleLogging:
         # Setup stdout redirection to capture print statements
         self.setup_stdout_redirection()
         
+        # Module loggers write to stdout too, so they reach the terminal and the log file
+        setup_app_logger()
+        
         # Create symlink to latest log
         self.create_latest_symlink()
     
@@ -107,7 +137,7 @@ class FastAPICompatibleLogging:
         
         # Create TeeLogger for stdout
         self.tee_logger = TeeLogger(
-            str(self.latest_log_file), 
+            str(self.main_log_file), 
             self.original_stdout
         )
         
@@ -116,7 +146,7 @@ class FastAPICompatibleLogging:
         
         # Also redirect stderr
         self.tee_stderr = TeeLogger(
-            str(self.latest_log_file), 
+            str(self.main_log_file), 
             self.original_stderr
         )
         sys.stderr = self.tee_stderr
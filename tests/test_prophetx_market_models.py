@@ -0,0 +1,33 @@
+"""Regression checks for ProphetXRawMarket's point lookup"""
+
+import pytest
+
+from app.models.prophetx_market_models import ProphetXLine, ProphetXRawMarket
+
+
+def _market(points):
+    lines = [ProphetXLine(f"line-{i}", f"Selection {i}", -110, point) for i, point in enumerate(points)]
+    return ProphetXRawMarket("market", "spread", 1, "Spread", lines)
+
+
+def _linear_scan(market, point, tolerance):
+    return [i for i, line in enumerate(market.lines)
+            if line.point is not None and abs(line.point - point) <= tolerance]
+
+
+@pytest.mark.parametrize("line_point, point, tolerance", [
+    (0.5, 0.5, 0.3),   # window spans three half-point buckets; the line sits in the middle one
+    (1.5, 1.5, 0.4),
+    (-2.5, -2.5, 0.25),
+])
+def test_point_lookup_checks_middle_bucket(line_point, point, tolerance):
+    market = _market([line_point])
+    assert [line.line_id for line in market.get_lines_by_point(point, tolerance)] == ["line-0"]
+
+
+@pytest.mark.parametrize("tolerance", [0.0, 0.1, 0.24, 0.25, 0.3, 0.4, 0.49, 0.5, 1.0])
+def test_point_lookup_matches_linear_scan(tolerance):
+    market = _market([None, -3.5, -3.0, -2.75, -2.5, -1.5, -0.5, 0.0, 0.25, 0.5, 1.0, 1.5, 2.5, 3.5])
+    for quarter in range(-20, 21):
+        point = quarter / 4
+        assert market.get_point_indices(point, tolerance) == _linear_scan(market, point, tolerance)